@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Module for the shared, rate limited API client."""
+import requests
+
+from cts_cli.utils.quota import INTERACTIVE, RateLimiter
+
+TIMEOUT = 10
+
+
+def get_session(ctx) -> requests.Session:
+    """
+    Get the HTTP session of the invocation, authenticated with the credentials.
+
+    The session is created once and kept in the context object so that every
+    request reuses the same connection pool and basic auth.
+
+    Args:
+        ctx: The context object.
+
+    Returns:
+        requests.Session: The authenticated session.
+    """
+    if ctx.obj.get("session") is None:
+        session = requests.Session()
+        session.auth = (ctx.obj.get("token"), ctx.obj.get("password"))
+        ctx.obj["session"] = session
+    return ctx.obj["session"]
+
+
+def get_rate_limiter(ctx) -> RateLimiter:
+    """
+    Get the rate limiter shared by the cts-cli processes.
+
+    Args:
+        ctx: The context object.
+
+    Returns:
+        RateLimiter: The rate limiter stored in the context object.
+    """
+    if ctx.obj.get("rate_limiter") is None:
+        ctx.obj["rate_limiter"] = RateLimiter(
+            ctx.obj.get("data_dir"),
+            rate=ctx.obj.get("rate_limit"),
+            daily_quota=ctx.obj.get("daily_quota"),
+        )
+    return ctx.obj["rate_limiter"]
+
+
+def api_get(
+    ctx, endpoint: str, params: dict = None, priority: str = INTERACTIVE
+) -> requests.Response:
+    """
+    Send a rate limited GET request to an endpoint of the SIRI API.
+
+    Args:
+        ctx: The context object.
+        endpoint (str): The endpoint path, e.g. "/stop-monitoring".
+        params (dict): The query parameters.
+        priority (str): INTERACTIVE for user lookups, BACKGROUND for refreshes.
+
+    Returns:
+        requests.Response: The API response.
+
+    Raises:
+        QuotaExceededError: If the daily quota is spent for this priority.
+    """
+    get_rate_limiter(ctx).acquire(endpoint, priority)
+    return get_session(ctx).get(
+        url=f"{ctx.obj.get('url')}{endpoint}", params=params, timeout=TIMEOUT
+    )
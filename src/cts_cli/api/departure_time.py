@@ -3,13 +3,22 @@
 from datetime import datetime, timezone
 import math
 
-import requests
-
+from cts_cli.api.client import api_get
+from cts_cli.utils.cache import (
+    get_cached_responses,
+    get_cached_station_refs,
+    open_cache,
+    store_responses,
+    store_station_refs,
+)
 from cts_cli.utils.loader import Loader
+from cts_cli.utils.quota import INTERACTIVE
 
 ESTIMATED_TIMETABLE_ENDPOINT = "/estimated-timetable"
 STOP_MONITORING_ENDPOINT = "/stop-monitoring"
-TIMEOUT = 10
+# stations rarely change, the whole estimated timetable is downloaded at most
+# this often for them
+STATION_REFS_MAX_AGE = 6 * 3600
 
 
 @Loader(desc="Collecting estimated timetable data.")
@@ -31,51 +40,115 @@ def get_estimated_time_raw_data(ctx) -> dict:
         >>> get_estimated_time_raw_data(ctx)
         {'key': 'value'}
     """
-    et_url = f"{ctx.obj.get('url')}{ESTIMATED_TIMETABLE_ENDPOINT}"
-    return requests.get(
-        url=et_url,
-        auth=(ctx.obj.get("token"), ctx.obj.get("password")),
-        timeout=TIMEOUT,
-    )
+    return api_get(ctx, ESTIMATED_TIMETABLE_ENDPOINT)
 
 
 @Loader(desc="Collecting departure times data. 🚋 🚌")
-def departure_time_call(ctx, station: str, estimated_time_data: dict) -> str:
+def departure_time_call(ctx, station: str, station_refs: dict) -> str:
     """
-    Get the departure time for a specific line, station, and destination.
+    Get the departure times of every line stopping at a station.
 
     Args:
-        url (str): The URL to make the API request.
-        token (str): The authentication token for the API.
-        user (str): The user identifier.
-        line (str): The line reference.
+        ctx: The context object.
         station (str): The name of the station.
-        destination (str): The name of the destination.
+        station_refs (dict): The StopPointRefs by station name.
 
     Returns:
-        dict: The departure information for the specified line, station, and destination.
+        list: The departures of the station.
     """
-    et_response = estimated_time_data
-    station_refs = get_station_ref(et_response, station)
-
-    sm_urls = [
-        f"{ctx.obj.get('url')}{STOP_MONITORING_ENDPOINT}?MonitoringRef={station_ref}"
-        for station_ref in station_refs
-    ]
-
-    responses_json = list(
-        map(
-            lambda url: requests.get(
-                url=url,
-                auth=(ctx.obj.get("token"), ctx.obj.get("password")),
-                timeout=TIMEOUT,
-            ).json(),
-            sm_urls,
-        )
+    responses_json = get_stop_monitoring_data(
+        ctx, find_stations_refs(station_refs, [station])
     )
     return get_station_departures(responses_json)
 
 
+def load_station_refs(
+    ctx, priority: str = INTERACTIVE, max_age: float = STATION_REFS_MAX_AGE
+) -> dict:
+    """
+    Get the StopPointRefs of every station, from the local cache when possible.
+
+    The references are collected from the estimated timetable, which is only
+    downloaded when the cached ones are older than `max_age` seconds.
+
+    Args:
+        ctx: The context object.
+        priority (str): INTERACTIVE for user lookups, BACKGROUND for refreshes.
+        max_age (float): The maximum age of the cached references. 0 always \
+downloads.
+
+    Returns:
+        dict: The StopPointRefs by station name.
+    """
+    conn = open_cache(ctx.obj.get("data_dir"))
+    try:
+        station_refs = get_cached_station_refs(conn, max_age) if max_age else {}
+        if not station_refs:
+            station_refs = collect_station_refs(
+                api_get(ctx, ESTIMATED_TIMETABLE_ENDPOINT, priority=priority).json()
+            )
+            store_station_refs(conn, station_refs)
+    finally:
+        conn.close()
+    return station_refs
+
+
+def get_stop_monitoring_data(
+    ctx, station_refs: list, priority: str = INTERACTIVE, max_age: float = None
+) -> list[dict]:
+    """
+    Get the stop monitoring JSON responses for a list of station references.
+
+    Responses cached less than `max_age` seconds ago are reused and the
+    downloaded ones are cached, when a cache max age is configured.
+
+    Args:
+        ctx: The context object.
+        station_refs (list): The StopPointRefs to monitor.
+        priority (str): INTERACTIVE for user lookups, BACKGROUND for refreshes.
+        max_age (float): The maximum age of a cached response, defaults to \
+the "cache_max_age" of the context object. 0 always downloads.
+
+    Returns:
+        list[dict]: One stop monitoring JSON response per distinct station \
+reference.
+    """
+    # get_station_ref returns one ref per matching call, request each once
+    station_refs = list(dict.fromkeys(station_refs))
+    if max_age is None:
+        max_age = ctx.obj.get("cache_max_age")
+    if max_age is None:
+        return [
+            api_get(
+                ctx,
+                STOP_MONITORING_ENDPOINT,
+                params={"MonitoringRef": station_ref},
+                priority=priority,
+            ).json()
+            for station_ref in station_refs
+        ]
+
+    conn = open_cache(ctx.obj.get("data_dir"))
+    try:
+        responses = get_cached_responses(conn, station_refs, max_age) if max_age else {}
+        fetched = {
+            station_ref: api_get(
+                ctx,
+                STOP_MONITORING_ENDPOINT,
+                params={"MonitoringRef": station_ref},
+                priority=priority,
+            ).json()
+            for station_ref in station_refs
+            if station_ref not in responses
+        }
+        if fetched:
+            store_responses(conn, fetched)
+    finally:
+        conn.close()
+    responses.update(fetched)
+    return [responses[station_ref] for station_ref in station_refs]
+
+
 def get_station_ref(json_response: dict, station_name: str) -> list:
     """
     Get the reference IDs of a station from the JSON response.
@@ -108,6 +181,53 @@ def get_station_ref(json_response: dict, station_name: str) -> list:
     ]
 
 
+def collect_station_refs(json_response: dict) -> dict:
+    """
+    Collect the reference IDs of every station from the JSON response.
+
+    Stations whose names only differ by case are merged, like `get_station_ref`
+    does.
+
+    Args:
+        json_response (dict): The estimated timetable JSON response.
+
+    Returns:
+        dict: The distinct reference IDs by station name, as first spelled.
+    """
+    names = {}
+    station_refs = {}
+    for ejv in json_response["ServiceDelivery"]["EstimatedTimetableDelivery"][0][
+        "EstimatedJourneyVersionFrame"
+    ][1:]:
+        for ej in ejv["EstimatedVehicleJourney"]:
+            for call in ej["EstimatedCalls"]:
+                name = call["StopPointName"]
+                name = names.setdefault(name.casefold(), name)
+                station_refs.setdefault(name, {})[call["StopPointRef"]] = None
+    return {name: list(refs) for name, refs in station_refs.items()}
+
+
+def find_stations_refs(station_refs: dict, station_names) -> list:
+    """
+    Get the distinct reference IDs of several stations, ignoring case.
+
+    Args:
+        station_refs (dict): The StopPointRefs by station name.
+        station_names: The names of the stations.
+
+    Returns:
+        list: The reference IDs of the stations, without duplicates.
+    """
+    refs_by_name = {name.casefold(): refs for name, refs in station_refs.items()}
+    return list(
+        dict.fromkeys(
+            station_ref
+            for station_name in station_names
+            for station_ref in refs_by_name.get(station_name.casefold(), [])
+        )
+    )
+
+
 def get_station_departures(json_responses: list[dict]) -> list:
     """
     Get the list of station departures from multiple JSON responses.
@@ -131,16 +251,7 @@ destination,
             ...
         ]
     """
-    monitored_stop_visits = [
-        monitored_stop_visit["ServiceDelivery"]["StopMonitoringDelivery"][0][
-            "MonitoredStopVisit"
-        ]
-        for monitored_stop_visit in json_responses
-        if monitored_stop_visit["ServiceDelivery"]["StopMonitoringDelivery"][0].get(
-            "MonitoredStopVisit"
-        )
-    ]
-    merged_stop_visits = [item for sublist in monitored_stop_visits for item in sublist]
+    merged_stop_visits = get_monitored_stop_visits(json_responses)
     schedules = [
         [
             stop["MonitoredVehicleJourney"]["LineRef"],
@@ -170,6 +281,28 @@ destination,
     return schedules
 
 
+def get_monitored_stop_visits(json_responses: list[dict]) -> list[dict]:
+    """
+    Flatten the MonitoredStopVisit entries of multiple stop monitoring responses.
+
+    Args:
+        json_responses (list[dict]): A list of stop monitoring JSON responses.
+
+    Returns:
+        list[dict]: Every MonitoredStopVisit found in the responses.
+    """
+    monitored_stop_visits = [
+        monitored_stop_visit["ServiceDelivery"]["StopMonitoringDelivery"][0][
+            "MonitoredStopVisit"
+        ]
+        for monitored_stop_visit in json_responses
+        if monitored_stop_visit["ServiceDelivery"]["StopMonitoringDelivery"][0].get(
+            "MonitoredStopVisit"
+        )
+    ]
+    return [item for sublist in monitored_stop_visits for item in sublist]
+
+
 def get_time_only(date_str: str) -> str:
     """
     Get the time component from a date string.
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Incremental departures model fed by successive stop monitoring polls."""
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import NamedTuple
+
+from cts_cli.api.departure_time import (
+    format_minutes,
+    get_monitored_stop_visits,
+    get_remaining_minutes,
+    get_time_only,
+)
+from cts_cli.api.record import get_vehicle_journey_ref
+
+INSERT = "insert"
+UPDATE = "update"
+REMOVE = "remove"
+
+
+class Departure(NamedTuple):
+    """A departure of a vehicle journey from a monitored stop."""
+
+    line: str
+    destination: str
+    expected: str
+    timestamp: float
+    aimed: str = ""
+    stop_name: str = ""
+
+
+class DeparturesModel:
+    """
+    Departures of the monitored stops, keyed by vehicle journey and stop.
+
+    Each poll is applied as a set of inserts, updates and removals against the
+    previous one: unchanged rows are neither re-parsed nor re-sorted, and the
+    changes are returned so that callers can display or store only them.
+
+    Attributes:
+        entries: The current departures by (vehicle journey ref, stop ref).
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty model.
+
+        Returns:
+            None
+        """
+        self.entries = {}
+        self._order = []
+
+    def apply(self, json_responses: list[dict]) -> list[tuple]:
+        """
+        Apply a new poll of stop monitoring responses to the model.
+
+        Args:
+            json_responses (list[dict]): A list of stop monitoring JSON responses.
+
+        Returns:
+            list[tuple]: The changes as (kind, key, old departure, new departure) \
+tuples, kind being one of INSERT, UPDATE or REMOVE.
+        """
+        changes = []
+        seen = set()
+        for stop in get_monitored_stop_visits(json_responses):
+            journey = stop["MonitoredVehicleJourney"]
+            call = journey["MonitoredCall"]
+            key = (
+                get_vehicle_journey_ref(journey),
+                stop.get("MonitoringRef") or call.get("StopPointRef"),
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            old = self.entries.get(key)
+            if old is not None and old.expected == call["ExpectedDepartureTime"]:
+                continue
+            new = Departure(
+                journey["LineRef"],
+                journey["DestinationName"],
+                call["ExpectedDepartureTime"],
+                datetime.fromisoformat(call["ExpectedDepartureTime"]).timestamp(),
+                call.get("AimedDepartureTime") or "",
+                call.get("StopPointName", ""),
+            )
+            if old is not None:
+                self._unindex(key, old)
+            self.entries[key] = new
+            insort(self._order, (new.timestamp, key))
+            changes.append((INSERT if old is None else UPDATE, key, old, new))
+
+        for key in [key for key in self.entries if key not in seen]:
+            old = self.entries.pop(key)
+            self._unindex(key, old)
+            changes.append((REMOVE, key, old, None))
+        return changes
+
+    def _unindex(self, key: tuple, departure: Departure):
+        """
+        Remove a departure from the sorted index.
+
+        Args:
+            key (tuple): The departure key.
+            departure (Departure): The departure currently indexed for the key.
+
+        Returns:
+            None
+        """
+        del self._order[bisect_left(self._order, (departure.timestamp, key))]
+
+    def rows(self, limit: int = 15) -> list[list]:
+        """
+        Get the next departures in the `get_station_departures` format.
+
+        Args:
+            limit (int): The maximum number of departures.
+
+        Returns:
+            list[list]: Rows of line, destination, expected departure time and \
+remaining minutes.
+        """
+        rows = []
+        for _, key in self._order[:limit]:
+            departure = self.entries[key]
+            rows.append(
+                [
+                    departure.line,
+                    departure.destination,
+                    get_time_only(departure.expected),
+                    format_minutes(get_remaining_minutes(departure.expected)),
+                ]
+            )
+        return rows
+
+
+def describe_change(change: tuple) -> str:
+    """
+    Describe a departures model change in a human-readable way.
+
+    Args:
+        change (tuple): A change as returned by `DeparturesModel.apply`.
+
+    Returns:
+        str: The change description.
+
+    Examples:
+        >>> describe_change((UPDATE, key, old, new))
+        'Line A to Graffenstaden: +2 min delay'
+    """
+    kind, _, old, new = change
+    departure = new or old
+    prefix = f"Line {departure.line} to {departure.destination}"
+    if kind == INSERT:
+        return f"{prefix}: departure at {get_time_only(new.expected)}"
+    if kind == REMOVE:
+        return f"{prefix}: departed at {get_time_only(old.expected)}"
+    shift = round((new.timestamp - old.timestamp) / 60)
+    if shift == 0:
+        return f"{prefix}: now at {get_time_only(new.expected)}"
+    return f"{prefix}: {shift:+d} min {'delay' if shift > 0 else 'advance'}"
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Module for the departure delay recording functions."""
+from datetime import datetime
+
+
+def get_vehicle_journey_ref(journey: dict) -> str:
+    """
+    Get a reference identifying a vehicle journey for a given service day.
+
+    Args:
+        journey (dict): A MonitoredVehicleJourney.
+
+    Returns:
+        str: The dated vehicle journey reference, prefixed by its data frame \
+when available.
+
+    Examples:
+        >>> get_vehicle_journey_ref({"FramedVehicleJourneyRef": \
+{"DataFrameRef": "2024-02-24", "DatedVehicleJourneyRef": "1234"}})
+        '2024-02-24:1234'
+    """
+    framed_ref = journey.get("FramedVehicleJourneyRef", {})
+    dated_ref = framed_ref.get("DatedVehicleJourneyRef") or journey.get(
+        "VehicleJourneyName"
+    )
+    if dated_ref is None:
+        # no journey identifier, fall back on the line and departure time
+        call = journey.get("MonitoredCall", {})
+        departure = call.get("AimedDepartureTime") or call.get("ExpectedDepartureTime")
+        dated_ref = f"{journey.get('LineRef')}@{departure}"
+    data_frame_ref = framed_ref.get("DataFrameRef")
+    return f"{data_frame_ref}:{dated_ref}" if data_frame_ref else dated_ref
+
+
+def get_change_records(changes: list[tuple], recorded_at: int) -> list[tuple]:
+    """
+    Build the delay records of the departures inserted or updated by a poll.
+
+    Args:
+        changes (list[tuple]): The changes returned by `DeparturesModel.apply`.
+        recorded_at (int): The poll timestamp, in seconds since epoch.
+
+    Returns:
+        list[tuple]: One record per inserted or updated departure with an \
+aimed time, containing the journey reference, stop reference, stop name, \
+line, destination, aimed and expected departure timestamps, delay in seconds \
+and poll timestamp.
+    """
+    records = []
+    for _, (journey_ref, stop_ref), _, departure in changes:
+        # removed departures have no new state, nor a delay without aimed time
+        if departure is None or not departure.aimed:
+            continue
+        aimed = int(datetime.fromisoformat(departure.aimed).timestamp())
+        expected = int(departure.timestamp)
+        records.append(
+            (
+                journey_ref,
+                stop_ref,
+                departure.stop_name,
+                departure.line,
+                departure.destination,
+                aimed,
+                expected,
+                expected - aimed,
+                recorded_at,
+            )
+        )
+    return records
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Module for merging the static schedule with real-time departures."""
+from datetime import datetime
+import math
+
+from cts_cli.api.departure_time import (
+    format_minutes,
+    get_monitored_stop_visits,
+    get_remaining_minutes,
+    get_time_only,
+)
+
+SCHEDULED_MARK = " *"
+
+
+def overlay_departures(
+    scheduled: list[tuple], json_responses: list[dict], limit: int = 15
+) -> list:
+    """
+    Overlay real-time departures on the scheduled departures of a station.
+
+    Scheduled departures of a line whose aimed time matches a real-time
+    departure are replaced by it. The remaining scheduled departures are kept
+    and their time is suffixed with SCHEDULED_MARK.
+
+    Args:
+        scheduled (list[tuple]): Departures as returned by `GtfsIndex.departures`.
+        json_responses (list[dict]): Stop monitoring JSON responses, can be empty.
+        limit (int): The maximum number of departures.
+
+    Returns:
+        list: Rows of line, destination, departure time and remaining minutes, \
+in the `get_station_departures` format.
+    """
+    covered = set()
+    schedules = set()
+    for stop in get_monitored_stop_visits(json_responses):
+        journey = stop["MonitoredVehicleJourney"]
+        call = journey["MonitoredCall"]
+        if call.get("AimedDepartureTime"):
+            aimed = datetime.fromisoformat(call["AimedDepartureTime"]).astimezone()
+            covered.add((journey["LineRef"], aimed.strftime("%H:%M")))
+        schedules.add(
+            (
+                journey["LineRef"],
+                journey["DestinationName"],
+                get_time_only(call["ExpectedDepartureTime"]),
+                get_remaining_minutes(call["ExpectedDepartureTime"]),
+            )
+        )
+
+    now = datetime.now()
+    for departure_datetime, line, headsign in scheduled:
+        if (line, departure_datetime.strftime("%H:%M")) in covered:
+            continue
+        schedules.add(
+            (
+                line,
+                headsign,
+                departure_datetime.strftime("%H:%M:%S") + SCHEDULED_MARK,
+                math.ceil((departure_datetime - now).total_seconds() / 60),
+            )
+        )
+
+    return [
+        [line, destination, departure, format_minutes(minutes)]
+        for line, destination, departure, minutes in sorted(
+            schedules, key=lambda x: x[3]
+        )[:limit]
+    ]
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""Module for the cached timetable functions."""
+from cts_cli.api.departure_time import get_estimated_time_raw_data
+from cts_cli.utils.timetable import Timetable, compile_timetable
+
+TIMETABLE_MAX_AGE = 3600
+
+
+def load_timetable(ctx, refresh: bool = False) -> Timetable:
+    """
+    Load the compiled timetable, downloading the estimated timetable first
+    when the cache is missing, older than TIMETABLE_MAX_AGE or refreshed.
+
+    Args:
+        ctx: The context object.
+        refresh (bool): Whether to download the estimated timetable anyway.
+
+    Returns:
+        Timetable: The compiled timetable.
+    """
+    data_dir = ctx.obj.get("data_dir")
+    age = Timetable.age(data_dir)
+    if refresh or age is None or age > TIMETABLE_MAX_AGE:
+        compile_timetable(get_estimated_time_raw_data(ctx).json(), data_dir)
+    return Timetable(data_dir)
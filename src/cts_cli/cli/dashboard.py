@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Module for the dashboard command."""
+import click
+import requests
+
+from cts_cli.api.departure_time import (
+    find_stations_refs,
+    get_stop_monitoring_data,
+    load_station_refs,
+)
+from cts_cli.api.departures_model import DeparturesModel
+from cts_cli.display.dashboard import build_dashboard
+from cts_cli.display.datesandtimes import today_date
+from cts_cli.display.departure_time import display_departure_time
+from cts_cli.utils.quota import BACKGROUND
+from cts_cli.utils.scheduler import FetchScheduler
+
+
+@click.command()
+@click.option(
+    "--station",
+    "-s",
+    "stations",
+    multiple=True,
+    required=True,
+    help="Station name to show, can be repeated.",
+)
+@click.option(
+    "--interval",
+    default=30,
+    show_default=True,
+    help="Seconds between two refreshes of a station.",
+)
+@click.option(
+    "--rows", default=8, show_default=True, help="Departures shown per station."
+)
+@click.pass_context
+def dashboard(ctx, stations, interval, rows):
+    """
+    Show the departures of several stations on one full-screen dashboard.
+    """
+    try:
+        station_refs = load_station_refs(ctx, priority=BACKGROUND)
+    except requests.RequestException as e:
+        click.echo(f"Could not get the estimated timetable: {e}")
+        return
+    station_refs = [find_stations_refs(station_refs, [station]) for station in stations]
+    if not all(station_refs):
+        station = stations[station_refs.index([])]
+        click.echo(f"Could not find data for {station}, check spelling.")
+        return
+
+    tables = ["Waiting for data..."] * len(stations)
+    boards = list(tables)
+    models = [DeparturesModel() for _ in stations]
+    app = build_dashboard(list(stations), boards)
+
+    def show(i, board):
+        if board != boards[i]:
+            boards[i] = board
+            app.invalidate()
+
+    def poll(i):
+        tables[i] = poll_station(ctx, station_refs[i], models[i], rows)
+        show(i, tables[i])
+
+    def show_error(i, error):
+        show(i, f"{tables[i]}\n\033[31mUpdate failed: {error}\033[0m")
+
+    scheduler = FetchScheduler(
+        [lambda i=i: poll(i) for i in range(len(stations))],
+        interval=interval,
+        on_error=show_error,
+    )
+    scheduler.start()
+    try:
+        app.run()
+    finally:
+        scheduler.stop()
+
+
+def poll_station(ctx, station_refs: list, model: DeparturesModel, rows: int) -> str:
+    """
+    Poll the departures of a station and render the text of its pane.
+
+    Args:
+        ctx: The context object.
+        station_refs (list): The StopPointRefs of the station.
+        model (DeparturesModel): The departures of the station, updated in place.
+        rows (int): The number of departures shown.
+
+    Returns:
+        str: The departures table, with the update date.
+    """
+    model.apply(
+        get_stop_monitoring_data(ctx, station_refs, priority=BACKGROUND, max_age=0)
+    )
+    table = display_departure_time(departure_time=model.rows(rows))
+    return f"Updated {today_date()}\n{table}"
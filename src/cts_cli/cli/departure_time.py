@@ -1,27 +1,196 @@
 # -*- coding: utf-8 -*-
 """Module for the departure time command."""
+from datetime import datetime
+import time
+
 import click
-from cts_cli.api.departure_time import departure_time_call, get_estimated_time_raw_data
+import requests
+from cts_cli.api.departure_time import (
+    departure_time_call,
+    find_stations_refs,
+    get_stop_monitoring_data,
+    load_station_refs,
+)
+from cts_cli.api.departures_model import DeparturesModel, describe_change
+from cts_cli.api.schedule import SCHEDULED_MARK, overlay_departures
 from cts_cli.display.departure_time import display_departure_time
 from cts_cli.display.datesandtimes import today_date
+from cts_cli.utils.cache import (
+    get_station_query_counts,
+    open_cache,
+    record_station_query,
+)
+from cts_cli.utils.gtfs import GtfsIndex
+from cts_cli.utils.loader import Loader
 from cts_cli.utils.suggester import suggester
 
 
 @click.command()
+@click.option(
+    "--watch",
+    "-w",
+    default=0,
+    help="Refresh the departures every WATCH seconds, only showing changes.",
+)
 @click.pass_context
-def departure_time(ctx):
+def departure_time(ctx, watch):
     """
     Get the estimated departure times for every lines that stops at a given station.
     """
-    estimated_time_data = get_estimated_time_raw_data(ctx)
-    station = suggester("Enter station name: ", estimated_time_data)
+    if not watch and GtfsIndex.exists(ctx.obj.get("data_dir")):
+        try:
+            index = GtfsIndex(ctx.obj.get("data_dir"))
+        except (OSError, KeyError, ValueError) as e:
+            click.echo(
+                f"Ignoring the GTFS index, run `cts-cli gtfs import FEED` again: {e}"
+            )
+        else:
+            scheduled_departure_time(ctx, index)
+            return
     try:
-        dep_time = departure_time_call(
-            ctx, station=station, estimated_time_data=estimated_time_data.json()
-        )
+        with Loader(desc="Collecting estimated timetable data."):
+            station_refs = load_station_refs(ctx)
+    except requests.RequestException as e:
+        click.echo(f"Could not get the estimated timetable: {e}")
+        return
+    station = ask_station(ctx, names=list(station_refs))
+    try:
+        if watch:
+            watch_departure_time(ctx, station, station_refs, watch)
+            return
+        dep_time = departure_time_call(ctx, station=station, station_refs=station_refs)
         table = display_departure_time(departure_time=dep_time)
         click.echo(
             f"Departure at station: \033[34m{station}\033[0m {today_date()}\n{table}"
         )
+        if dep_time:
+            count_station_query(ctx, station)
     except IndexError as e:
         click.echo(f"Could not find data for {station}, check spelling: {e}")
+    except requests.RequestException as e:
+        click.echo(f"Could not get departures for {station}: {e}")
+
+
+def ask_station(ctx, **suggestions) -> str:
+    """
+    Prompt for a station name, suggesting the most queried stations first.
+
+    Args:
+        ctx: The context object.
+        suggestions: The `suggester` keyword arguments giving the station names.
+
+    Returns:
+        str: The station name.
+    """
+    conn = open_cache(ctx.obj.get("data_dir"))
+    try:
+        return suggester(
+            "Enter station name: ",
+            counts=get_station_query_counts(conn),
+            **suggestions,
+        )
+    finally:
+        conn.close()
+
+
+def count_station_query(ctx, station: str):
+    """
+    Count a station lookup, once departures were found for it.
+
+    Args:
+        ctx: The context object.
+        station (str): The name of the station.
+
+    Returns:
+        None
+    """
+    conn = open_cache(ctx.obj.get("data_dir"))
+    try:
+        record_station_query(conn, station)
+    finally:
+        conn.close()
+
+
+def watch_departure_time(ctx, station: str, station_refs: dict, interval: int):
+    """
+    Poll the departures of a station and redraw them with the latest changes.
+
+    Args:
+        ctx: The context object.
+        station (str): The name of the station.
+        station_refs (dict): The StopPointRefs by station name.
+        interval (int): The number of seconds between two polls.
+
+    Returns:
+        None
+    """
+    station_refs = find_stations_refs(station_refs, [station])
+    model = DeparturesModel()
+    first_poll = True
+    try:
+        while True:
+            try:
+                changes = model.apply(
+                    get_stop_monitoring_data(ctx, station_refs, max_age=0)
+                )
+            except requests.RequestException as e:
+                # keep the previous table on screen, the next poll may succeed
+                click.echo(f"\033[31mUpdate failed: {e}\033[0m")
+            else:
+                table = display_departure_time(departure_time=model.rows())
+                click.clear()
+                click.echo(
+                    f"Departure at station: \033[34m{station}\033[0m "
+                    f"{today_date()}\n{table}"
+                )
+                if not first_poll:
+                    for change in changes:
+                        click.echo(describe_change(change))
+                elif changes:
+                    count_station_query(ctx, station)
+                first_poll = False
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        click.echo()
+
+
+def scheduled_departure_time(ctx, index: GtfsIndex):
+    """
+    Show the scheduled departures of a station from the GTFS index right away,
+    then overlay the real-time departures once they are downloaded.
+
+    Args:
+        ctx: The context object.
+        index (GtfsIndex): The opened GTFS index, closed once read.
+
+    Returns:
+        None
+    """
+    try:
+        station = ask_station(ctx, names=index.stations)
+        scheduled = index.departures(station, datetime.now())
+    finally:
+        index.close()
+    header = f"Departure at station: \033[34m{station}\033[0m {today_date()}"
+    legend = f"{SCHEDULED_MARK.strip()} scheduled time"
+    if scheduled:
+        table = display_departure_time(departure_time=overlay_departures(scheduled, []))
+        click.echo(f"{header}\n{table}\n{legend}")
+
+    try:
+        responses_json = get_stop_monitoring_data(
+            ctx, find_stations_refs(load_station_refs(ctx), [station])
+        )
+    except requests.RequestException as e:
+        if scheduled:
+            count_station_query(ctx, station)
+        click.echo(f"Real-time data unavailable: {e}")
+        return
+    dep_time = overlay_departures(scheduled, responses_json)
+    if not dep_time:
+        click.echo(f"Could not find data for {station}, check spelling.")
+        return
+    count_station_query(ctx, station)
+    click.clear()
+    table = display_departure_time(departure_time=dep_time)
+    click.echo(f"{header}\n{table}\n{legend}")
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Module for the GTFS static schedule commands."""
+from datetime import datetime
+import timeit
+
+import click
+
+from cts_cli.utils.gtfs import GtfsIndex, compile_gtfs
+
+
+@click.group()
+def gtfs():
+    """
+    Manage the offline static schedule compiled from the CTS GTFS feed.
+    """
+
+
+@gtfs.command("import")
+@click.argument("feed", type=click.Path(exists=True))
+@click.pass_context
+def import_feed(ctx, feed):
+    """
+    Compile a GTFS FEED (zip file or directory) into the departure index.
+    """
+    try:
+        stations, departures = compile_gtfs(feed, ctx.obj.get("data_dir"))
+    except ValueError as e:
+        click.echo(f"Could not import {feed}: {e}")
+        return
+    click.echo(f"Indexed {departures} departures from {stations} stations.")
+
+
+@gtfs.command()
+@click.option(
+    "--number", default=10, show_default=True, help="Lookups per station to time."
+)
+@click.pass_context
+def bench(ctx, number):
+    """
+    Time the next departures lookup of every station of the index.
+    """
+    data_dir = ctx.obj.get("data_dir")
+    if not GtfsIndex.exists(data_dir):
+        click.echo("No GTFS index, run `cts-cli gtfs import FEED` first.")
+        return
+    index = GtfsIndex(data_dir)
+    now = datetime.now()
+    try:
+        elapsed = timeit.timeit(
+            lambda: [index.departures(station, now) for station in index.stations],
+            number=number,
+        )
+    finally:
+        index.close()
+    lookups = number * len(index.stations)
+    click.echo(
+        f"{lookups} lookups in {elapsed:.3f} s: "
+        f"{elapsed / max(lookups, 1) * 1e6:.1f} µs per station."
+    )
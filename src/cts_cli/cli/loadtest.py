@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Module for the mock server and load test commands."""
+import click
+import requests
+
+from cts_cli.display.loadtest import display_load_test
+from cts_cli.utils.loadtest import run_load_test
+from cts_cli.utils.mock_server import MockNetwork, MockSiriServer
+
+
+def network_options(command):
+    """
+    Add the mock network and fault options to a command.
+    """
+    for option in reversed(
+        [
+            click.option("--lines", default=10, show_default=True, help="Lines."),
+            click.option("--stops", default=100, show_default=True, help="Stops."),
+            click.option(
+                "--stops-per-line",
+                default=20,
+                show_default=True,
+                help="Stops served by each line.",
+            ),
+            click.option(
+                "--latency",
+                default=0.05,
+                show_default=True,
+                help="Mean response latency in seconds.",
+            ),
+            click.option(
+                "--jitter",
+                default=0.02,
+                show_default=True,
+                help="Latency standard deviation in seconds.",
+            ),
+            click.option(
+                "--error-rate",
+                default=0.0,
+                show_default=True,
+                help="Share of failing requests, between 0 and 1.",
+            ),
+        ]
+    ):
+        command = option(command)
+    return command
+
+
+@click.command("mock-server")
+@network_options
+@click.option("--port", default=8080, show_default=True, help="Port to listen on.")
+def mock_server(  # pylint: disable=too-many-arguments
+    lines, stops, stops_per_line, latency, jitter, error_rate, port
+):
+    """
+    Serve a generated network on a local mock of the SIRI 2.0 API.
+
+    Point the CLI to it with API_URL=http://127.0.0.1:PORT.
+    """
+    server = MockSiriServer(
+        MockNetwork(lines, stops, stops_per_line, hours=24),
+        port=port,
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+    )
+    click.echo(f"Serving {server.url}, press Ctrl-C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo()
+    finally:
+        server.server_close()
+
+
+@click.command()
+@network_options
+@click.option(
+    "--queries", default=200, show_default=True, help="Departure queries to run."
+)
+@click.option(
+    "--concurrency", default=10, show_default=True, help="Concurrent queries."
+)
+@click.option("--url", help="SIRI base URL to test instead of a local mock server.")
+@click.option(
+    "--rate-limit",
+    is_flag=True,
+    help="Go through the configured rate limit and daily quota, shared with the "
+    "other cts-cli processes.",
+)
+@click.pass_context
+def loadtest(  # pylint: disable=too-many-arguments
+    ctx,
+    lines,
+    stops,
+    stops_per_line,
+    latency,
+    jitter,
+    error_rate,
+    queries,
+    concurrency,
+    url,
+    rate_limit,
+):
+    """
+    Run concurrent departure queries and report latencies and throughput.
+
+    Queries measure the API alone, unless --rate-limit is given.
+    """
+    limits = None
+    mode = "no rate limit"
+    if rate_limit:
+        limits = {
+            "rate_limit": ctx.obj.get("rate_limit"),
+            "daily_quota": ctx.obj.get("daily_quota"),
+            "data_dir": ctx.obj.get("data_dir"),
+        }
+        mode = f"the shared rate limit of {limits['rate_limit']} requests per minute"
+    server = None
+    if url is None:
+        server = MockSiriServer(
+            MockNetwork(lines, stops, stops_per_line),
+            latency=latency,
+            jitter=jitter,
+            error_rate=error_rate,
+        )
+        server.start()
+        url = server.url
+    try:
+        report = run_load_test(url, queries, concurrency, limits)
+    except requests.RequestException as e:
+        click.echo(f"Load test failed: {e}")
+        return
+    finally:
+        if server is not None:
+            server.stop()
+    max_rss = report["max_rss"]
+    # the mock server runs in this process, its memory is included
+    memory = "peak memory" if server is None else "peak memory with the mock server"
+    click.echo(
+        f"{report['stations']} stations, {queries} queries on {concurrency} threads "
+        f"with {mode} in {report['elapsed']:.1f} s, {memory}: "
+        f"{f'{max_rss / 1024:.0f} MB' if max_rss else 'unknown'}\n"
+        f"{display_load_test(report['operations'])}"
+    )
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Module for the prefetch command."""
+import time
+
+import click
+import requests
+
+from cts_cli.api.departure_time import (
+    STATION_REFS_MAX_AGE,
+    find_stations_refs,
+    get_stop_monitoring_data,
+    load_station_refs,
+)
+from cts_cli.utils.cache import get_station_query_counts, open_cache
+from cts_cli.utils.quota import BACKGROUND
+
+
+@click.command()
+@click.option(
+    "--top",
+    default=10,
+    show_default=True,
+    help="Number of most queried stations to keep fresh.",
+)
+@click.option(
+    "--interval",
+    type=int,
+    help="Seconds between two refreshes, defaults to half the cache max age.",
+)
+@click.option("--once", is_flag=True, help="Refresh the stations once and exit.")
+@click.pass_context
+def prefetch(ctx, top, interval, once):
+    """
+    Keep the station references and the departures of the most queried stations
+    fresh in the local cache.
+    """
+    if interval is None:
+        interval = max(ctx.obj.get("cache_max_age") // 2, 1)
+    try:
+        while True:
+            conn = open_cache(ctx.obj.get("data_dir"))
+            try:
+                stations = list(get_station_query_counts(conn, limit=top))
+            finally:
+                conn.close()
+            try:
+                # refresh the station references before departure-time needs to
+                station_refs = load_station_refs(
+                    ctx, priority=BACKGROUND, max_age=STATION_REFS_MAX_AGE / 2
+                )
+                get_stop_monitoring_data(
+                    ctx,
+                    find_stations_refs(station_refs, stations),
+                    priority=BACKGROUND,
+                    max_age=0,
+                )
+                click.echo(f"Refreshed {len(stations)} stations: {', '.join(stations)}")
+            except requests.RequestException as e:
+                click.echo(f"Refresh failed: {e}")
+            if once:
+                return
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        click.echo("\nPrefetch stopped.")
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""Module for the API quota command."""
+import click
+
+from cts_cli.api.client import get_rate_limiter
+from cts_cli.display.quota import display_quota
+
+
+@click.command()
+@click.pass_context
+def quota(ctx):
+    """
+    Show the API requests made per day and endpoint and the remaining rate.
+    """
+    tokens, counters = get_rate_limiter(ctx).usage()
+    daily_quota = ctx.obj.get("daily_quota") or "unlimited"
+    rate_limit = ctx.obj.get("rate_limit")
+    available = (
+        f"{int(tokens)}/{rate_limit} per minute" if rate_limit > 0 else "unlimited"
+    )
+    click.echo(
+        f"Requests available now: {available}, daily quota: {daily_quota}\n"
+        f"{display_quota(counters)}"
+    )
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Module for the delay recording and statistics commands."""
+import time
+
+import click
+import requests
+
+from cts_cli.api.departure_time import (
+    find_stations_refs,
+    get_stop_monitoring_data,
+    load_station_refs,
+)
+from cts_cli.api.departures_model import DeparturesModel
+from cts_cli.api.record import get_change_records
+from cts_cli.display.stats import display_delay_stats
+from cts_cli.utils.delay_store import (
+    insert_delay_records,
+    open_delay_store,
+    query_delay_stats,
+)
+from cts_cli.utils.quota import BACKGROUND
+
+
+@click.command()
+@click.option(
+    "--station",
+    "-s",
+    "stations",
+    multiple=True,
+    required=True,
+    help="Station name to record, can be repeated.",
+)
+@click.option(
+    "--interval", default=60, show_default=True, help="Seconds between two polls."
+)
+@click.option(
+    "--count", default=0, help="Number of polls before stopping, 0 runs forever."
+)
+@click.pass_context
+def record(ctx, stations, interval, count):
+    """
+    Record aimed and expected departure times of the given stations.
+    """
+    try:
+        station_refs = load_station_refs(ctx, priority=BACKGROUND)
+    except requests.RequestException as e:
+        click.echo(f"Could not get the estimated timetable: {e}")
+        return
+    station_refs = find_stations_refs(station_refs, stations)
+    if not station_refs:
+        click.echo(f"Could not find data for {', '.join(stations)}, check spelling.")
+        return
+
+    conn = open_delay_store(ctx.obj.get("data_dir"))
+    model = DeparturesModel()
+    polls = 0
+    try:
+        while not count or polls < count:
+            polls += 1
+            try:
+                responses_json = get_stop_monitoring_data(
+                    ctx, station_refs, priority=BACKGROUND, max_age=0
+                )
+            except requests.RequestException as e:
+                click.echo(f"Poll {polls} failed: {e}")
+            else:
+                # only store the departures that changed since the previous poll
+                records = get_change_records(
+                    model.apply(responses_json), int(time.time())
+                )
+                written = insert_delay_records(conn, records)
+                click.echo(f"Poll {polls}: {written} departures updated.")
+            if not count or polls < count:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        click.echo("\nRecording stopped.")
+    finally:
+        conn.close()
+
+
+@click.command()
+@click.option("--line", "-l", help="Only show statistics for this line.")
+@click.option("--stop", "-s", help="Only show statistics for this stop name.")
+@click.option(
+    "--days", default=30, show_default=True, help="Number of past days to analyse."
+)
+@click.pass_context
+def stats(ctx, line, stop, days):
+    """
+    Show punctuality statistics from the recorded departures.
+    """
+    conn = open_delay_store(ctx.obj.get("data_dir"))
+    try:
+        rows = query_delay_stats(
+            conn, line=line, stop=stop, since=int(time.time()) - days * 86400
+        )
+    finally:
+        conn.close()
+    if not rows:
+        click.echo("No recorded departures, run `cts-cli record` first.")
+        return
+    click.echo(display_delay_stats(rows))
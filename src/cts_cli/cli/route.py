@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Module for the route command."""
+from datetime import datetime
+
+import click
+import requests
+
+from cts_cli.api.timetable import load_timetable
+from cts_cli.display.route import display_route
+
+
+@click.command()
+@click.argument("origin")
+@click.argument("destination")
+@click.option(
+    "--depart",
+    "-d",
+    type=click.DateTime(formats=["%H:%M"]),
+    help="Departure time (HH:MM), defaults to now.",
+)
+@click.option("--refresh", is_flag=True, help="Download the estimated timetable again.")
+@click.pass_context
+def route(ctx, origin, destination, depart, refresh):
+    """
+    Find the earliest arrival journey from ORIGIN to DESTINATION stations.
+    """
+    try:
+        timetable = load_timetable(ctx, refresh=refresh)
+    except requests.RequestException as e:
+        click.echo(f"Could not get the estimated timetable: {e}")
+        return
+    origin_id = timetable.station_id(origin)
+    destination_id = timetable.station_id(destination)
+    for station, station_id in ((origin, origin_id), (destination, destination_id)):
+        if station_id is None:
+            click.echo(f"Could not find data for {station}, check spelling.")
+            return
+
+    now = datetime.now()
+    if depart is not None:
+        now = now.replace(hour=depart.hour, minute=depart.minute, second=0)
+    legs = timetable.route(origin_id, destination_id, int(now.timestamp()))
+    if not legs:
+        click.echo(f"No journey found from {origin} to {destination}.")
+        return
+    click.echo(
+        f"Journey from \033[34m{timetable.stations[origin_id]}\033[0m to "
+        f"\033[34m{timetable.stations[destination_id]}\033[0m\n"
+        f"{display_route(legs, timetable.stations, timetable.trips)}"
+    )
@@ -1,15 +1,28 @@
 # -*- coding: utf-8 -*-
 """Module for gathering all commands."""
+import os
+
 import click
 from decouple import Config, config
 
+from cts_cli.cli.dashboard import dashboard
 from cts_cli.cli.departure_time import departure_time
+from cts_cli.cli.gtfs import gtfs
+from cts_cli.cli.loadtest import loadtest, mock_server
+from cts_cli.cli.prefetch import prefetch
+from cts_cli.cli.quota import quota
+from cts_cli.cli.record import record, stats
+from cts_cli.cli.route import route
 
 file_config = Config(".env.dev")
 API_URL = config("API_URL", default="https://api.cts-strasbourg.eu")
 API_VERSION = config("API_VERSION", default="v1")
 TOKEN = config("TOKEN")
 PASSWORD = config("PASSWORD")
+DATA_DIR = config("DATA_DIR", default=os.path.expanduser("~/.cts-cli"))
+RATE_LIMIT = config("RATE_LIMIT", default=60, cast=int)
+DAILY_QUOTA = config("DAILY_QUOTA", default=0, cast=int)
+CACHE_MAX_AGE = config("CACHE_MAX_AGE", default=30, cast=int)
 
 
 @click.group()
@@ -20,7 +33,20 @@ def cli(ctx):
         "url": f"{API_URL}/{API_VERSION}/siri/2.0",
         "token": TOKEN,
         "password": PASSWORD,
+        "data_dir": DATA_DIR,
+        "rate_limit": RATE_LIMIT,
+        "daily_quota": DAILY_QUOTA,
+        "cache_max_age": CACHE_MAX_AGE,
     }
 
 
+cli.add_command(dashboard)
 cli.add_command(departure_time)
+cli.add_command(gtfs)
+cli.add_command(loadtest)
+cli.add_command(mock_server)
+cli.add_command(prefetch)
+cli.add_command(quota)
+cli.add_command(record)
+cli.add_command(route)
+cli.add_command(stats)
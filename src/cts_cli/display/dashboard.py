@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Multi-station dashboard display module."""
+import math
+
+from prompt_toolkit.application import Application
+from prompt_toolkit.formatted_text import ANSI
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout import HSplit, Layout, VSplit, Window
+from prompt_toolkit.layout.controls import FormattedTextControl
+from prompt_toolkit.widgets import Frame
+
+
+def build_dashboard(stations: list, boards: list) -> Application:
+    """
+    Build a full-screen application showing one pane per station.
+
+    Panes read their text from `boards` on every render, so updating an item
+    and invalidating the application redraws it. The renderer only writes the
+    terminal cells that changed since the previous frame.
+
+    Args:
+        stations (list): The station names, used as pane titles.
+        boards (list): The text of each pane, may contain ANSI colors.
+
+    Returns:
+        Application: The dashboard application, exited with q or Ctrl-C.
+    """
+    panes = [
+        Frame(
+            Window(FormattedTextControl(lambda i=i: ANSI(boards[i]))),
+            title=station,
+        )
+        for i, station in enumerate(stations)
+    ]
+    columns = math.ceil(math.sqrt(len(panes)))
+    rows = [
+        VSplit(panes[start : start + columns])
+        for start in range(0, len(panes), columns)
+    ]
+
+    bindings = KeyBindings()
+
+    @bindings.add("q")
+    @bindings.add("c-c")
+    def _exit(event):
+        event.app.exit()
+
+    return Application(
+        layout=Layout(HSplit(rows)), key_bindings=bindings, full_screen=True
+    )
@@ -2,7 +2,6 @@
 """Departure time display module."""
 from prettytable import PrettyTable
 
-
 table = PrettyTable()
 
 
@@ -19,6 +18,7 @@ the departure time information.
     """
     labels = ["Line", "Destination", "Departure Time", "Departure in"]
     table.field_names = labels
+    table.clear_rows()
     table.add_rows(departure_time)
 
     return table
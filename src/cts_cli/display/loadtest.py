@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""Load test report display module."""
+from prettytable import PrettyTable
+
+
+def display_load_test(operations: list[list]) -> str:
+    """
+    Display the load test summary rows in a formatted table.
+
+    Args:
+        operations (list[list]): Rows as returned by `summarize`.
+
+    Returns:
+        str: The formatted table as a string.
+    """
+    table = PrettyTable()
+    table.field_names = [
+        "Operation",
+        "Calls",
+        "Errors",
+        "p50 (ms)",
+        "p90 (ms)",
+        "p99 (ms)",
+        "Max (ms)",
+        "Throughput (/s)",
+    ]
+    table.add_rows(
+        [
+            [
+                f"{value:.1f}" if isinstance(value, float) else value
+                for value in operation
+            ]
+            for operation in operations
+        ]
+    )
+    return table
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""API quota display module."""
+from prettytable import PrettyTable
+
+
+def display_quota(counters: dict) -> str:
+    """
+    Display the API request counters in a formatted table.
+
+    Args:
+        counters (dict): The request counters by day and endpoint.
+
+    Returns:
+        str: The formatted table as a string, most recent day first.
+    """
+    table = PrettyTable()
+    table.field_names = ["Day", "Endpoint", "Requests"]
+    table.add_rows(
+        [
+            [day, endpoint, count]
+            for day in sorted(counters, reverse=True)
+            for endpoint, count in sorted(counters[day].items())
+        ]
+    )
+    return table
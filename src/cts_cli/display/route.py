@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Journey display module."""
+from datetime import datetime
+
+from prettytable import PrettyTable
+
+
+def display_route(legs: list[tuple], stations: list, trips: list) -> str:
+    """
+    Display the legs of a journey in a formatted table.
+
+    Args:
+        legs (list[tuple]): Legs as returned by `Timetable.route`.
+        stations (list): The station names, by index.
+        trips (list): The line and destination of each trip, by index.
+
+    Returns:
+        str: The formatted table as a string.
+    """
+    table = PrettyTable()
+    table.field_names = ["Line", "Direction", "From", "Departure", "To", "Arrival"]
+    table.add_rows(
+        [
+            [
+                trips[trip][0],
+                trips[trip][1],
+                stations[dep_station],
+                datetime.fromtimestamp(dep_time).strftime("%H:%M"),
+                stations[arr_station],
+                datetime.fromtimestamp(arr_time).strftime("%H:%M"),
+            ]
+            for trip, dep_station, dep_time, arr_station, arr_time in legs
+        ]
+    )
+    return table
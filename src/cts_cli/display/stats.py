@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Delay statistics display module."""
+from prettytable import PrettyTable
+
+
+def display_delay_stats(stats: list[list]) -> str:
+    """
+    Display the punctuality statistics in a formatted table.
+
+    Args:
+        stats (list[list]): Rows as returned by `query_delay_stats`.
+
+    Returns:
+        str: The formatted table as a string.
+    """
+    table = PrettyTable()
+    table.field_names = [
+        "Line",
+        "Stop",
+        "Departures",
+        "Average delay",
+        "Max delay",
+        "On time",
+    ]
+    table.add_rows(
+        [
+            [
+                line,
+                stop,
+                count,
+                f"{average / 60:.1f} min",
+                f"{maximum / 60:.1f} min",
+                f"{on_time:.0f} %",
+            ]
+            for line, stop, count, average, maximum, on_time in stats
+        ]
+    )
+    return table
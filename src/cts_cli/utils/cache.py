@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""SQLite cache of stop monitoring responses, station references and query frequency."""
+import json
+import os
+import sqlite3
+import time
+
+CACHE_FILE = "cache.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stop_monitoring (
+    station_ref TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    response TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS station_refs (
+    station TEXT PRIMARY KEY,
+    refs TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS station_queries (
+    station TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    last_queried REAL NOT NULL
+);
+"""
+
+
+def open_cache(data_dir: str) -> sqlite3.Connection:
+    """
+    Open (and create if needed) the cache in the given directory.
+
+    Args:
+        data_dir (str): The directory holding the cts-cli local data.
+
+    Returns:
+        sqlite3.Connection: A connection to the cache in WAL mode.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(data_dir, CACHE_FILE))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def get_cached_responses(
+    conn: sqlite3.Connection, station_refs: list, max_age: float
+) -> dict:
+    """
+    Get the cached stop monitoring responses fresher than `max_age` seconds.
+
+    Args:
+        conn (sqlite3.Connection): The cache connection.
+        station_refs (list): The StopPointRefs to look up.
+        max_age (float): The maximum age of a response, in seconds.
+
+    Returns:
+        dict: The JSON responses by station reference.
+    """
+    placeholders = ", ".join("?" * len(station_refs))
+    rows = conn.execute(
+        f"SELECT station_ref, response FROM stop_monitoring "
+        f"WHERE station_ref IN ({placeholders}) AND fetched_at >= ?",
+        [*station_refs, time.time() - max_age],
+    )
+    return {station_ref: json.loads(response) for station_ref, response in rows}
+
+
+def store_responses(conn: sqlite3.Connection, responses: dict):
+    """
+    Store stop monitoring responses, replacing the previous ones.
+
+    Args:
+        conn (sqlite3.Connection): The cache connection.
+        responses (dict): The JSON responses by station reference.
+
+    Returns:
+        None
+    """
+    now = time.time()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO stop_monitoring VALUES (?, ?, ?)",
+            [
+                (station_ref, now, json.dumps(response))
+                for station_ref, response in responses.items()
+            ],
+        )
+
+
+def get_cached_station_refs(conn: sqlite3.Connection, max_age: float) -> dict:
+    """
+    Get the cached station references, when stored less than `max_age` seconds ago.
+
+    Args:
+        conn (sqlite3.Connection): The cache connection.
+        max_age (float): The maximum age of the references, in seconds.
+
+    Returns:
+        dict: The StopPointRefs by station name, empty when missing or too old.
+    """
+    rows = conn.execute(
+        "SELECT station, refs FROM station_refs WHERE fetched_at >= ?",
+        (time.time() - max_age,),
+    )
+    return {station: json.loads(refs) for station, refs in rows}
+
+
+def store_station_refs(conn: sqlite3.Connection, station_refs: dict):
+    """
+    Store the station references, replacing all the previous ones.
+
+    Args:
+        conn (sqlite3.Connection): The cache connection.
+        station_refs (dict): The StopPointRefs by station name.
+
+    Returns:
+        None
+    """
+    now = time.time()
+    with conn:
+        conn.execute("DELETE FROM station_refs")
+        conn.executemany(
+            "INSERT INTO station_refs VALUES (?, ?, ?)",
+            [
+                (station, json.dumps(refs), now)
+                for station, refs in station_refs.items()
+            ],
+        )
+
+
+def record_station_query(conn: sqlite3.Connection, station: str):
+    """
+    Count a lookup of a station.
+
+    Args:
+        conn (sqlite3.Connection): The cache connection.
+        station (str): The station name, as typed.
+
+    Returns:
+        None
+    """
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO station_queries VALUES (?, ?, 1, ?)
+            ON CONFLICT (station) DO UPDATE SET
+                name = excluded.name,
+                count = count + 1,
+                last_queried = excluded.last_queried
+            """,
+            (station.casefold(), station, time.time()),
+        )
+
+
+def get_station_query_counts(conn: sqlite3.Connection, limit: int = None) -> dict:
+    """
+    Get the lookup counts of the stations, most queried first.
+
+    Args:
+        conn (sqlite3.Connection): The cache connection.
+        limit (int): The maximum number of stations, all when None.
+
+    Returns:
+        dict: The lookup counts by station name, as last typed.
+    """
+    rows = conn.execute(
+        "SELECT name, count FROM station_queries "
+        "ORDER BY count DESC, last_queried DESC LIMIT ?",
+        (-1 if limit is None else limit,),
+    )
+    return dict(rows)
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""SQLite store for recorded departure delays, with daily rollups."""
+import os
+import sqlite3
+import time
+
+DELAY_STORE_FILE = "delays.sqlite3"
+ON_TIME_THRESHOLD = 60
+DAY = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS departures (
+    journey_ref TEXT NOT NULL,
+    stop_ref TEXT NOT NULL,
+    stop_name TEXT NOT NULL,
+    line_ref TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    aimed_departure INTEGER NOT NULL,
+    expected_departure INTEGER NOT NULL,
+    delay INTEGER NOT NULL,
+    recorded_at INTEGER NOT NULL,
+    PRIMARY KEY (journey_ref, stop_ref)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS departures_line_idx
+    ON departures (line_ref, aimed_departure);
+CREATE INDEX IF NOT EXISTS departures_stop_idx
+    ON departures (stop_name COLLATE NOCASE, aimed_departure);
+CREATE INDEX IF NOT EXISTS departures_time_idx
+    ON departures (aimed_departure, line_ref, stop_name, delay);
+CREATE TABLE IF NOT EXISTS daily_delays (
+    day INTEGER NOT NULL,
+    line_ref TEXT NOT NULL,
+    stop_name TEXT NOT NULL,
+    departures INTEGER NOT NULL,
+    total_delay INTEGER NOT NULL,
+    max_delay INTEGER NOT NULL,
+    on_time INTEGER NOT NULL,
+    PRIMARY KEY (day, line_ref, stop_name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    rolled_until INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO rollup_state VALUES (1, 0);
+"""
+
+UPSERT = """
+INSERT INTO departures VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (journey_ref, stop_ref) DO UPDATE SET
+    expected_departure = excluded.expected_departure,
+    delay = excluded.delay,
+    recorded_at = excluded.recorded_at
+WHERE excluded.recorded_at >= departures.recorded_at
+"""
+
+ROLLUP = f"""
+INSERT OR REPLACE INTO daily_delays
+SELECT aimed_departure / {DAY}, line_ref, stop_name, COUNT(*), SUM(delay),
+       MAX(delay), SUM(delay < {ON_TIME_THRESHOLD})
+FROM departures INDEXED BY departures_time_idx
+WHERE aimed_departure >= ? AND aimed_departure < ?
+GROUP BY 1, line_ref, stop_name
+"""
+
+
+def open_delay_store(data_dir: str) -> sqlite3.Connection:
+    """
+    Open (and create if needed) the delay store in the given directory.
+
+    Args:
+        data_dir (str): The directory holding the cts-cli local data.
+
+    Returns:
+        sqlite3.Connection: A connection to the store in WAL mode.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(data_dir, DELAY_STORE_FILE))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def insert_delay_records(conn: sqlite3.Connection, records: list[tuple]) -> int:
+    """
+    Insert a batch of delay records in a single transaction.
+
+    A record already stored for the same vehicle journey and stop is updated
+    with the latest expected departure time instead of being duplicated. Days
+    already rolled up are rolled up again if a record departs on them.
+
+    Args:
+        conn (sqlite3.Connection): The delay store connection.
+        records (list[tuple]): Records as returned by `get_change_records`.
+
+    Returns:
+        int: The number of records written.
+    """
+    with conn:
+        conn.executemany(UPSERT, records)
+        if records:
+            oldest = min(record[5] for record in records) // DAY * DAY
+            conn.execute(
+                "UPDATE rollup_state SET rolled_until = MIN(rolled_until, ?)",
+                (oldest,),
+            )
+    return len(records)
+
+
+def update_daily_rollup(conn: sqlite3.Connection) -> int:
+    """
+    Roll up the departures of the closed days into daily statistics.
+
+    A day is closed once the following day is over, as departures are only
+    recorded while they are being monitored.
+
+    Args:
+        conn (sqlite3.Connection): The delay store connection.
+
+    Returns:
+        int: The timestamp until which the departures are rolled up.
+    """
+    closed_until = (int(time.time()) // DAY - 1) * DAY
+    (rolled_until,) = conn.execute("SELECT rolled_until FROM rollup_state").fetchone()
+    if rolled_until < closed_until:
+        with conn:
+            conn.execute(ROLLUP, (rolled_until, closed_until))
+            conn.execute("UPDATE rollup_state SET rolled_until = ?", (closed_until,))
+        rolled_until = closed_until
+    return rolled_until
+
+
+def query_delay_stats(
+    conn: sqlite3.Connection,
+    line: str = None,
+    stop: str = None,
+    since: int = None,
+    until: int = None,
+) -> list[list]:
+    """
+    Compute punctuality statistics grouped by line and stop.
+
+    Args:
+        conn (sqlite3.Connection): The delay store connection.
+        line (str): Only keep departures of this line.
+        stop (str): Only keep departures from this stop name (case insensitive).
+        since (int): Only keep departures aimed after this timestamp.
+        until (int): Only keep departures aimed before this timestamp.
+
+    Returns:
+        list[list]: Rows of line, stop name, number of departures, average \
+delay in seconds, maximum delay in seconds and on time percentage.
+    """
+    clauses, params = [], []
+    if line is not None:
+        clauses.append("AND line_ref = ?")
+        params.append(line)
+    if stop is not None:
+        clauses.append("AND stop_name = ? COLLATE NOCASE")
+        params.append(stop)
+    filters = " ".join(clauses)
+    since = 0 if since is None else since
+    until = 2**62 if until is None else until
+    # whole days are read from the rollup, the partial ones from the departures
+    rolled_from = -(-since // DAY) * DAY
+    rolled_to = max(min(until // DAY * DAY, update_daily_rollup(conn)), rolled_from)
+    query = f"""
+        SELECT line_ref, stop_name, SUM(departures), 1.0 * SUM(total_delay) /
+               SUM(departures), MAX(max_delay), 100.0 * SUM(on_time) /
+               SUM(departures)
+        FROM (
+            SELECT line_ref, stop_name, departures, total_delay, max_delay, on_time
+            FROM daily_delays WHERE day >= ? AND day < ? {filters}
+            UNION ALL
+            SELECT line_ref, stop_name, 1, delay, delay, delay < {ON_TIME_THRESHOLD}
+            FROM departures INDEXED BY departures_time_idx
+            WHERE aimed_departure >= ? AND aimed_departure < ? {filters}
+            UNION ALL
+            SELECT line_ref, stop_name, 1, delay, delay, delay < {ON_TIME_THRESHOLD}
+            FROM departures INDEXED BY departures_time_idx
+            WHERE aimed_departure >= ? AND aimed_departure < ? {filters}
+        )
+        GROUP BY line_ref, stop_name
+        ORDER BY line_ref, stop_name
+    """
+    return [
+        list(row)
+        for row in conn.execute(
+            query,
+            [
+                rolled_from // DAY,
+                rolled_to // DAY,
+                *params,
+                since,
+                min(rolled_from, until),
+                *params,
+                max(rolled_to, since),
+                until,
+                *params,
+            ],
+        )
+    ]
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""Compiled GTFS static schedule index."""
+from array import array
+from bisect import bisect_left
+import csv
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import io
+import json
+import mmap
+import os
+import struct
+from typing import Iterator, NamedTuple, Sequence
+import zipfile
+
+GTFS_INDEX_FILE = "gtfs.bin"
+GTFS_META_FILE = "gtfs.json"
+GTFS_MAGIC = b"CTSG"
+GTFS_VERSION = 1
+HEADER = struct.Struct("<4sIII")
+MAX_COLUMN_ID = 0xFFFF
+WEEKDAYS = [
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+]
+
+
+class GtfsColumns(NamedTuple):
+    """The columns of the binary index, in file order."""
+
+    offsets: Sequence[int]
+    times: Sequence[int]
+    lines: Sequence[int]
+    headsigns: Sequence[int]
+    services: Sequence[int]
+
+
+def read_gtfs_table(feed_path: str, name: str) -> Iterator[dict]:
+    """
+    Read a table of a GTFS feed, either a zip file or an extracted directory.
+
+    Rows are streamed, so that large tables like stop_times.txt are never held
+    in memory at once.
+
+    Args:
+        feed_path (str): The path of the GTFS feed.
+        name (str): The table file name, e.g. "stop_times.txt".
+
+    Yields:
+        dict: The table rows, none if the table is missing.
+    """
+    if zipfile.is_zipfile(feed_path):
+        with zipfile.ZipFile(feed_path) as feed:
+            if name not in feed.namelist():
+                return
+            with feed.open(name) as table:
+                yield from csv.DictReader(io.TextIOWrapper(table, encoding="utf-8-sig"))
+        return
+    table_path = os.path.join(feed_path, name)
+    if not os.path.exists(table_path):
+        return
+    with open(table_path, encoding="utf-8-sig", newline="") as table:
+        yield from csv.DictReader(table)
+
+
+def parse_gtfs_time(gtfs_time: str) -> int:
+    """
+    Convert a GTFS time, which can go past 24:00:00, to seconds after midnight.
+
+    Examples:
+        >>> parse_gtfs_time("25:10:00")
+        90600
+    """
+    hours, minutes, seconds = gtfs_time.strip().split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def compile_gtfs(feed_path: str, data_dir: str) -> tuple[int, int]:
+    """
+    Compile a GTFS feed into a per station departure index.
+
+    The binary index holds, for every station name, its departures sorted by
+    time in fixed-width columns (times, lines, headsigns, services) that can be
+    binary searched in place once memory-mapped. Names and calendars are kept
+    in a JSON file next to it.
+
+    Args:
+        feed_path (str): The path of the GTFS feed, zip file or directory.
+        data_dir (str): The directory holding the cts-cli local data.
+
+    Returns:
+        tuple[int, int]: The number of stations and of departures indexed.
+
+    Raises:
+        ValueError: If the feed has more lines, headsigns or services than \
+the index columns can hold.
+    """
+    names = {"lines": {}, "headsigns": {}, "services": {}}
+    trips = read_gtfs_trips(feed_path, names)
+    stations, departures = read_gtfs_departures(feed_path, trips)
+
+    os.makedirs(data_dir, exist_ok=True)
+    index_path = os.path.join(data_dir, GTFS_INDEX_FILE)
+    with open(f"{index_path}.tmp", "wb") as index_file:
+        n_departures = write_gtfs_columns(index_file, departures)
+    os.replace(f"{index_path}.tmp", index_path)
+
+    meta_path = os.path.join(data_dir, GTFS_META_FILE)
+    with open(f"{meta_path}.tmp", "w", encoding="utf-8") as meta_file:
+        json.dump(
+            {
+                "stations": [name for _, name in sorted(stations.values())],
+                **{column: list(values) for column, values in names.items()},
+                "calendar": list(read_gtfs_table(feed_path, "calendar.txt")),
+                "calendar_dates": list(
+                    read_gtfs_table(feed_path, "calendar_dates.txt")
+                ),
+            },
+            meta_file,
+        )
+    os.replace(f"{meta_path}.tmp", meta_path)
+    return len(stations), n_departures
+
+
+def get_column_id(names: dict, column: str, name: str) -> int:
+    """
+    Get the index of a name in a 16-bit index column, adding it if needed.
+
+    Args:
+        names (dict): The names of every column, by column then name.
+        column (str): The column, one of "lines", "headsigns" or "services".
+        name (str): The name to index.
+
+    Returns:
+        int: The index of the name in the column.
+
+    Raises:
+        ValueError: If the column already holds 65536 names.
+    """
+    ids = names[column]
+    if name not in ids:
+        if len(ids) > MAX_COLUMN_ID:
+            raise ValueError(
+                f"The GTFS feed has more than {MAX_COLUMN_ID + 1} {column}, "
+                "which the index cannot hold."
+            )
+        ids[name] = len(ids)
+    return ids[name]
+
+
+def read_gtfs_trips(feed_path: str, names: dict) -> dict:
+    """
+    Read the line, headsign and service indexes of every trip of a GTFS feed.
+
+    Args:
+        feed_path (str): The path of the GTFS feed, zip file or directory.
+        names (dict): The names of every column, filled with the trips ones.
+
+    Returns:
+        dict: The (line, headsign, service) indexes by trip ID.
+    """
+    route_lines = {
+        route["route_id"]: route.get("route_short_name") or route["route_id"]
+        for route in read_gtfs_table(feed_path, "routes.txt")
+    }
+    return {
+        trip["trip_id"]: (
+            get_column_id(
+                names, "lines", route_lines.get(trip["route_id"], trip["route_id"])
+            ),
+            get_column_id(names, "headsigns", trip.get("trip_headsign", "")),
+            get_column_id(names, "services", trip["service_id"]),
+        )
+        for trip in read_gtfs_table(feed_path, "trips.txt")
+    }
+
+
+def read_gtfs_departures(feed_path: str, trips: dict) -> tuple[dict, list]:
+    """
+    Group the departures of a GTFS feed by station name.
+
+    Args:
+        feed_path (str): The path of the GTFS feed, zip file or directory.
+        trips (dict): The (line, headsign, service) indexes by trip ID.
+
+    Returns:
+        tuple[dict, list]: The (index, name) of the stations by casefolded \
+name, and the packed departures of each station index.
+    """
+    stop_names = {
+        stop["stop_id"]: stop["stop_name"]
+        for stop in read_gtfs_table(feed_path, "stops.txt")
+    }
+    stations = {}
+    departures = []
+    for stop_time in read_gtfs_table(feed_path, "stop_times.txt"):
+        trip = trips.get(stop_time["trip_id"])
+        name = stop_names.get(stop_time["stop_id"])
+        if trip is None or name is None or not stop_time.get("departure_time"):
+            continue
+        station = stations.setdefault(name.casefold(), (len(stations), name))[0]
+        if station == len(departures):
+            departures.append([])
+        line, headsign, service = trip
+        # pack each departure in a single int so that sorting orders by time
+        departures[station].append(
+            parse_gtfs_time(stop_time["departure_time"]) << 48
+            | line << 32
+            | headsign << 16
+            | service
+        )
+    return stations, departures
+
+
+def write_gtfs_columns(index_file, departures: list) -> int:
+    """
+    Write the header and the columns of the binary index.
+
+    Args:
+        index_file: The binary file to write to.
+        departures (list): The packed departures of each station index.
+
+    Returns:
+        int: The number of departures written.
+    """
+    offsets = array("I", [0])
+    columns = GtfsColumns(offsets, array("I"), array("H"), array("H"), array("H"))
+    for station_departures in departures:
+        station_departures.sort()
+        for packed in station_departures:
+            columns.times.append(packed >> 48)
+            columns.lines.append(packed >> 32 & MAX_COLUMN_ID)
+            columns.headsigns.append(packed >> 16 & MAX_COLUMN_ID)
+            columns.services.append(packed & MAX_COLUMN_ID)
+        offsets.append(len(columns.times))
+    index_file.write(
+        HEADER.pack(GTFS_MAGIC, GTFS_VERSION, len(departures), len(columns.times))
+    )
+    for column in columns:
+        column.tofile(index_file)
+    return len(columns.times)
+
+
+class GtfsIndex:
+    """
+    A memory-mapped view of the compiled GTFS departure index.
+
+    Args:
+        data_dir: The directory holding the cts-cli local data.
+
+    Attributes:
+        stations: The station names, in index order.
+        lines: The line names, by line index.
+        headsigns: The trip headsigns, by headsign index.
+
+    Methods:
+        exists: Whether an index has been compiled in a directory.
+        departures: Gets the next scheduled departures from a station.
+        close: Unmaps the index.
+    """
+
+    def __init__(self, data_dir):
+        """
+        Opens the compiled index of the given directory.
+
+        Args:
+            data_dir: The directory holding the cts-cli local data.
+
+        Returns:
+            None
+
+        Raises:
+            OSError: If the index files can not be read.
+            ValueError: If the index files are not a compatible GTFS index.
+        """
+        meta_path = os.path.join(data_dir, GTFS_META_FILE)
+        with open(meta_path, encoding="utf-8") as meta_file:
+            self._meta = json.load(meta_file)
+        self._station_ids = {name.casefold(): i for i, name in enumerate(self.stations)}
+        self._services = {
+            service: i for i, service in enumerate(self._meta["services"])
+        }
+
+        with open(os.path.join(data_dir, GTFS_INDEX_FILE), "rb") as index_file:
+            self._mmap = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, n_stations, n_records = HEADER.unpack_from(self._mmap)
+        except struct.error:
+            magic = version = n_stations = n_records = None
+        if (
+            magic != GTFS_MAGIC
+            or version != GTFS_VERSION
+            or len(self._mmap) != HEADER.size + (n_stations + 1) * 4 + n_records * 10
+        ):
+            self._mmap.close()
+            raise ValueError("Incompatible GTFS index, run `cts-cli gtfs import`.")
+        self._view = memoryview(self._mmap)
+        start = HEADER.size
+        columns = []
+        for count, code, size in [
+            (n_stations + 1, "I", 4),
+            (n_records, "I", 4),
+            (n_records, "H", 2),
+            (n_records, "H", 2),
+            (n_records, "H", 2),
+        ]:
+            columns.append(self._view[start : start + count * size].cast(code))
+            start += count * size
+        self._columns = GtfsColumns(*columns)
+
+    @property
+    def stations(self) -> list:
+        """The station names, in index order."""
+        return self._meta["stations"]
+
+    @property
+    def lines(self) -> list:
+        """The line names, by line index."""
+        return self._meta["lines"]
+
+    @property
+    def headsigns(self) -> list:
+        """The trip headsigns, by headsign index."""
+        return self._meta["headsigns"]
+
+    @staticmethod
+    def exists(data_dir: str) -> bool:
+        """
+        Whether a GTFS index has been compiled in the given directory.
+        """
+        return os.path.exists(os.path.join(data_dir, GTFS_INDEX_FILE))
+
+    @lru_cache(maxsize=8)
+    def _active_services(self, day: date) -> frozenset:
+        """
+        Get the indexes of the services running on a given day.
+
+        Args:
+            day (date): The service day.
+
+        Returns:
+            frozenset: The running service indexes.
+        """
+        day_str = day.strftime("%Y%m%d")
+        weekday = WEEKDAYS[day.weekday()]
+        active = {
+            service["service_id"]
+            for service in self._meta["calendar"]
+            if service["start_date"] <= day_str <= service["end_date"]
+            and service[weekday] == "1"
+        }
+        for exception in self._meta["calendar_dates"]:
+            if exception["date"] != day_str:
+                continue
+            if exception["exception_type"] == "1":
+                active.add(exception["service_id"])
+            else:
+                active.discard(exception["service_id"])
+        return frozenset(
+            self._services[service] for service in active if service in self._services
+        )
+
+    def departures(self, station: str, when: datetime, limit: int = 15) -> list[tuple]:
+        """
+        Get the next scheduled departures from a station.
+
+        Trips of the previous service day running after midnight are included.
+
+        Args:
+            station (str): The station name (case insensitive).
+            when (datetime): The local time to search from.
+            limit (int): The maximum number of departures.
+
+        Returns:
+            list[tuple]: Departures as (datetime, line, headsign) tuples sorted \
+by time, empty if the station is unknown.
+        """
+        station_id = self._station_ids.get(station.casefold())
+        if station_id is None:
+            return []
+        columns = self._columns
+        first, last = columns.offsets[station_id], columns.offsets[station_id + 1]
+        departures = []
+        for day in (when.date(), when.date() - timedelta(days=1)):
+            midnight = datetime.combine(day, datetime.min.time(), when.tzinfo)
+            active = self._active_services(day)
+            found = 0
+            i = bisect_left(
+                columns.times, int((when - midnight).total_seconds()), first, last
+            )
+            while i < last and found < limit:
+                if columns.services[i] in active:
+                    departures.append(
+                        (
+                            midnight + timedelta(seconds=columns.times[i]),
+                            self.lines[columns.lines[i]],
+                            self.headsigns[columns.headsigns[i]],
+                        )
+                    )
+                    found += 1
+                i += 1
+        return sorted(departures)[:limit]
+
+    def close(self):
+        """
+        Unmaps the index.
+
+        Returns:
+            None
+        """
+        for column in self._columns:
+            column.release()
+        self._view.release()
+        self._mmap.close()
@@ -65,6 +65,9 @@ class Loader:
         Returns:
             None
         """
+        # a new thread each time, a decorated function may be called again
+        self.done = False
+        self._thread = Thread(target=self._animate, daemon=True)
         self._thread.start()
 
     def _animate(self):
@@ -87,8 +90,8 @@ class Loader:
         Returns:
             None
         """
+        self.done = True
         if sys.stdout.isatty():  # Check if running in a terminal
-            self.done = True
             cols = get_terminal_size().columns
             click.echo("\r" + " " * cols, nl=False)
             click.echo(f"\r{self.end}", nl=False)
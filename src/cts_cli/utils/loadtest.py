@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""Scalability load test of the departure queries."""
+from concurrent.futures import ThreadPoolExecutor
+import math
+import random
+import sys
+import tempfile
+from threading import local
+import time
+from types import SimpleNamespace
+
+import requests
+
+from cts_cli.api.client import api_get
+from cts_cli.api.departure_time import (
+    ESTIMATED_TIMETABLE_ENDPOINT,
+    get_station_departures,
+    get_station_ref,
+    get_stop_monitoring_data,
+)
+from cts_cli.utils.suggester import collect_sation_names
+
+ESTIMATED_TIMETABLE_ATTEMPTS = 5
+LOAD_TEST_SEED = 0
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+def percentile(values: list, share: float) -> float:
+    """
+    Get a percentile of values with the nearest rank method.
+
+    Examples:
+        >>> percentile([1, 2, 3, 4], 0.5)
+        2
+    """
+    ordered = sorted(values)
+    return ordered[max(math.ceil(share * len(ordered)) - 1, 0)]
+
+
+def summarize(operation: str, latencies: list, errors: int, elapsed: float) -> list:
+    """
+    Summarize the latencies of an operation.
+
+    Args:
+        operation (str): The operation name.
+        latencies (list): The latencies of the successful calls, in seconds.
+        errors (int): The number of failed calls.
+        elapsed (float): The wall time of all the calls, in seconds.
+
+    Returns:
+        list: The operation, calls, errors, p50, p90, p99 and max latencies \
+in milliseconds and throughput in calls per second.
+    """
+    if not latencies:
+        return [operation, errors, errors, None, None, None, None, 0.0]
+    return [
+        operation,
+        len(latencies) + errors,
+        errors,
+        percentile(latencies, 0.5) * 1000,
+        percentile(latencies, 0.9) * 1000,
+        percentile(latencies, 0.99) * 1000,
+        max(latencies) * 1000,
+        (len(latencies) + errors) / elapsed if elapsed else 0.0,
+    ]
+
+
+def timed(function, *args, **kwargs) -> tuple:
+    """
+    Call a function and measure its duration.
+
+    Returns:
+        tuple: The result and the duration in seconds.
+    """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def get_max_rss() -> int:
+    """
+    Get the peak resident memory of the process.
+
+    Returns:
+        int: The peak resident memory in kilobytes, None when unavailable.
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes where Linux reports kilobytes
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def get_estimated_timetable(ctx) -> tuple:
+    """
+    Download the estimated timetable, retrying failed responses.
+
+    Args:
+        ctx: The context object.
+
+    Returns:
+        tuple: The last response and its latency in seconds.
+    """
+    for attempt in range(ESTIMATED_TIMETABLE_ATTEMPTS):
+        response, latency = timed(api_get, ctx, ESTIMATED_TIMETABLE_ENDPOINT)
+        if response.ok or attempt == ESTIMATED_TIMETABLE_ATTEMPTS - 1:
+            break
+    return response, latency
+
+
+def thread_contexts(obj: dict):
+    """
+    Get a function giving each thread its own context object, thus its own
+    HTTP session.
+
+    Args:
+        obj (dict): The context object items.
+
+    Returns:
+        The function getting the context object of the current thread.
+    """
+    contexts = local()
+
+    def get_ctx():
+        if not hasattr(contexts, "ctx"):
+            contexts.ctx = SimpleNamespace(obj=dict(obj))
+        return contexts.ctx
+
+    return get_ctx
+
+
+def run_queries(get_ctx, estimated_time_data: dict, stations: list, concurrency: int):
+    """
+    Run the departure queries of stations concurrently.
+
+    Args:
+        get_ctx: Gets the context object of the current thread.
+        estimated_time_data (dict): The estimated timetable JSON response.
+        stations (list): The station of each query.
+        concurrency (int): The number of concurrent queries.
+
+    Returns:
+        list: The "departure query" summary row.
+    """
+
+    def query(station):
+        try:
+            station_refs = get_station_ref(estimated_time_data, station)
+            get_station_departures(get_stop_monitoring_data(get_ctx(), station_refs))
+            return True
+        except requests.RequestException:
+            return False
+
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for succeeded, latency in executor.map(
+            lambda station: timed(query, station), stations
+        ):
+            if succeeded:
+                latencies.append(latency)
+            else:
+                errors += 1
+    return summarize("departure query", latencies, errors, time.perf_counter() - start)
+
+
+def run_load_test(
+    url: str, queries: int, concurrency: int, limits: dict = None
+) -> dict:
+    """
+    Run concurrent departure queries against a SIRI API.
+
+    The estimated timetable is downloaded once and station names collected
+    from it, as `departure-time` does on a cold cache. Then `queries` departure queries of
+    random stations (station refs lookup, stop monitoring fan-out and
+    departures building) run on `concurrency` threads, each thread using its
+    own session. Requests share one rate limiter and the response cache is
+    disabled.
+
+    Args:
+        url (str): The SIRI base URL.
+        queries (int): The number of departure queries.
+        concurrency (int): The number of concurrent queries.
+        limits (dict): The "rate_limit", "daily_quota" and "data_dir" of the \
+rate limiter shared with the other cts-cli processes, None to measure the \
+API alone.
+
+    Returns:
+        dict: The "operations" summary rows, the "stations" count, the \
+"elapsed" time in seconds and the "max_rss" peak resident memory in \
+kilobytes (None when unavailable).
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        get_ctx = thread_contexts(
+            {
+                "url": url,
+                "token": "",
+                "password": "",
+                "data_dir": temp_dir,
+                "rate_limit": 0,
+                "daily_quota": 0,
+                **(limits or {}),
+            }
+        )
+        operations = []
+        start = time.perf_counter()
+        response, latency = get_estimated_timetable(get_ctx())
+        operations.append(summarize("estimated-timetable", [latency], 0, latency))
+        estimated_time_data = response.json()
+        names, latency = timed(collect_sation_names, response)
+        operations.append(summarize("collect_sation_names", [latency], 0, latency))
+        stations = random.Random(LOAD_TEST_SEED).choices(names, k=queries)
+
+        latencies = [
+            timed(get_station_ref, estimated_time_data, station)[1]
+            for station in stations[: min(queries, 50)]
+        ]
+        operations.append(summarize("get_station_ref", latencies, 0, sum(latencies)))
+        operations.append(
+            run_queries(get_ctx, estimated_time_data, stations, concurrency)
+        )
+
+    return {
+        "operations": operations,
+        "stations": len(names),
+        "elapsed": time.perf_counter() - start,
+        "max_rss": get_max_rss(),
+    }
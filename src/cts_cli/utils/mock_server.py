@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""Local mock of the CTS SIRI 2.0 API, for scalability tests."""
+from bisect import bisect_left
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+from threading import Thread
+import time
+from urllib.parse import parse_qs, urlparse
+
+HEADWAY = 600
+MONITORED_VISITS = 20
+
+
+class MockNetwork:  # pylint: disable=too-few-public-methods
+    """
+    A generated network of lines serving random stops, in both directions.
+
+    Args:
+        lines: The number of lines.
+        stops: The number of distinct stops.
+        stops_per_line: The number of stops served by each line.
+        hours: The number of hours of service, starting now.
+        seed: The random seed, for reproducible networks.
+
+    Attributes:
+        estimated_timetable: The `/estimated-timetable` JSON response, encoded.
+        stop_names: The stop names.
+
+    Methods:
+        stop_monitoring: Builds the `/stop-monitoring` response of a stop.
+    """
+
+    def __init__(self, lines=10, stops=100, stops_per_line=20, hours=3, seed=0):
+        """
+        Generates the network and its estimated timetable.
+
+        Args:
+            lines: The number of lines.
+            stops: The number of distinct stops.
+            stops_per_line: The number of stops served by each line.
+            hours: The number of hours of service, starting now.
+            seed: The random seed, for reproducible networks.
+
+        Returns:
+            None
+        """
+        rng = random.Random(seed)
+        self.stop_names = [f"Stop {i}" for i in range(stops)]
+        self._visits = {}
+        start = int(time.time()) // HEADWAY * HEADWAY - HEADWAY
+        frames = [{"EstimatedVehicleJourney": []}]
+        for line in range(lines):
+            served = rng.sample(range(stops), min(stops_per_line, stops))
+            frames.append(
+                {
+                    "EstimatedVehicleJourney": [
+                        self._add_journey(f"L{line}", direction, sequence, departure)
+                        for direction, sequence in enumerate([served, served[::-1]])
+                        for departure in range(start, start + hours * 3600, HEADWAY)
+                    ]
+                }
+            )
+        for visits in self._visits.values():
+            visits.sort()
+        self.estimated_timetable = json.dumps(
+            {
+                "ServiceDelivery": {
+                    "EstimatedTimetableDelivery": [
+                        {"EstimatedJourneyVersionFrame": frames}
+                    ]
+                }
+            }
+        ).encode()
+
+    def _add_journey(
+        self, line: str, direction: int, sequence: list, departure: int
+    ) -> dict:
+        """
+        Build a vehicle journey and register its calls as stop visits.
+
+        Args:
+            line (str): The LineRef.
+            direction (int): 0 for the outward trip, 1 for the return trip.
+            sequence (list): The indexes of the served stops, in order.
+            departure (int): The departure timestamp from the first stop.
+
+        Returns:
+            dict: The EstimatedVehicleJourney.
+        """
+        destination = self.stop_names[sequence[-1]]
+        journey_ref = f"{line}-{direction}-{departure}"
+        calls = []
+        for rank, stop in enumerate(sequence):
+            aimed = departure + rank * 90
+            stop_ref = f"{stop}{'AB'[direction]}"
+            calls.append(
+                {
+                    "StopPointRef": stop_ref,
+                    "StopPointName": self.stop_names[stop],
+                    "ExpectedDepartureTime": iso_time(aimed),
+                }
+            )
+            self._visits.setdefault(stop_ref, []).append(
+                (aimed, line, destination, journey_ref, stop)
+            )
+        return {
+            "LineRef": line,
+            "DestinationName": destination,
+            "DatedVehicleJourneyRef": journey_ref,
+            "EstimatedCalls": calls,
+        }
+
+    def stop_monitoring(self, stop_ref: str, rng: random.Random) -> bytes:
+        """
+        Build the `/stop-monitoring` response of a stop, with random delays.
+
+        Args:
+            stop_ref (str): The MonitoringRef.
+            rng (random.Random): The random generator of the delays.
+
+        Returns:
+            bytes: The encoded JSON response.
+        """
+        visits = self._visits.get(stop_ref, [])
+        first = bisect_left(visits, (int(time.time()),))
+        monitored = []
+        for aimed, line, destination, journey_ref, stop in visits[
+            first : first + MONITORED_VISITS
+        ]:
+            monitored.append(
+                {
+                    "MonitoringRef": stop_ref,
+                    "MonitoredVehicleJourney": {
+                        "LineRef": line,
+                        "DestinationName": destination,
+                        "FramedVehicleJourneyRef": {
+                            "DataFrameRef": iso_time(aimed)[:10],
+                            "DatedVehicleJourneyRef": journey_ref,
+                        },
+                        "MonitoredCall": {
+                            "StopPointRef": stop_ref,
+                            "StopPointName": self.stop_names[stop],
+                            "AimedDepartureTime": iso_time(aimed),
+                            "ExpectedDepartureTime": iso_time(
+                                aimed + rng.choice([0, 0, 0, 60, 120, 300])
+                            ),
+                        },
+                    },
+                }
+            )
+        return json.dumps(
+            {
+                "ServiceDelivery": {
+                    "StopMonitoringDelivery": [{"MonitoredStopVisit": monitored}]
+                }
+            }
+        ).encode()
+
+
+def iso_time(timestamp: int) -> str:
+    """
+    Format a timestamp as a local ISO datetime with its UTC offset.
+    """
+    return datetime.fromtimestamp(timestamp).astimezone().isoformat()
+
+
+class MockSiriServer(ThreadingHTTPServer):
+    """
+    HTTP server answering `/estimated-timetable` and `/stop-monitoring`.
+
+    Every response is delayed by a normally distributed latency, and fails
+    with a 503 status at the given error rate.
+
+    Args:
+        network: The MockNetwork to serve.
+        port: The port to listen on, 0 for any free port.
+        latency: The mean response latency, in seconds.
+        jitter: The standard deviation of the latency, in seconds.
+        error_rate: The share of requests failing, between 0 and 1.
+
+    Attributes:
+        url: The SIRI base URL, to use as the "url" of the context object.
+
+    Methods:
+        start: Serves requests from a background thread.
+        stop: Stops serving requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, network, port=0, latency=0.0, jitter=0.0, error_rate=0.0):
+        """
+        Binds the server on localhost.
+
+        Args:
+            network: The MockNetwork to serve.
+            port: The port to listen on, 0 for any free port.
+            latency: The mean response latency, in seconds.
+            jitter: The standard deviation of the latency, in seconds.
+            error_rate: The share of requests failing, between 0 and 1.
+
+        Returns:
+            None
+        """
+        super().__init__(("127.0.0.1", port), MockSiriHandler)
+        self.network = network
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random()
+        self.url = f"http://127.0.0.1:{self.server_address[1]}/v1/siri/2.0"
+        self._thread = Thread(target=self.serve_forever, daemon=True)
+
+    def start(self):
+        """
+        Serves requests from a background thread.
+
+        Returns:
+            None
+        """
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops serving requests and closes the socket.
+
+        Returns:
+            None
+        """
+        self.shutdown()
+        self.server_close()
+
+
+class MockSiriHandler(BaseHTTPRequestHandler):
+    """Request handler of the MockSiriServer."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Answers a SIRI GET request after the simulated latency.
+
+        Returns:
+            None
+        """
+        server = self.server
+        time.sleep(max(server.rng.gauss(server.latency, server.jitter), 0))
+        url = urlparse(self.path)
+        if server.rng.random() < server.error_rate:
+            self._respond(503, b"Service Unavailable", "text/plain")
+        elif url.path.endswith("/estimated-timetable"):
+            self._respond(200, server.network.estimated_timetable)
+        elif url.path.endswith("/stop-monitoring"):
+            stop_ref = parse_qs(url.query).get("MonitoringRef", [""])[0]
+            self._respond(200, server.network.stop_monitoring(stop_ref, server.rng))
+        else:
+            self._respond(404, b"Not Found", "text/plain")
+
+    def _respond(self, status: int, body: bytes, content_type="application/json"):
+        """
+        Sends a response.
+
+        Args:
+            status (int): The HTTP status.
+            body (bytes): The response body.
+            content_type (str): The body content type.
+
+        Returns:
+            None
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """
+        Silences the request logs.
+        """
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Client side rate limiting and API quota accounting."""
+from contextlib import contextmanager
+from datetime import date
+import json
+import os
+import time
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+QUOTA_STATE_FILE = "quota.json"
+QUOTA_LOCK_FILE = "quota.lock"
+QUOTA_HISTORY_DAYS = 7
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+
+class QuotaExceededError(requests.RequestException):
+    """Raised when the daily API quota does not allow a request."""
+
+
+class RateLimiter:
+    """
+    A token bucket shared by every cts-cli process through a lock file.
+
+    Tokens are refilled at `rate` requests per minute up to `rate`. Background
+    requests leave a `reserve` share of the bucket and of the daily quota to
+    interactive requests, so that lookups pre-empt background refreshes when
+    the budget runs short. Requests are counted per endpoint and per day.
+
+    Args:
+        data_dir: The directory holding the cts-cli local data.
+        rate: The number of requests allowed per minute, 0 for no limit.
+        daily_quota: The number of requests allowed per day, 0 for no limit.
+        reserve: The share of the budget kept for interactive requests.
+
+    Methods:
+        acquire: Waits for a token and counts the request.
+        usage: Gets the remaining tokens and the request counters.
+    """
+
+    def __init__(self, data_dir, rate=60, daily_quota=0, reserve=0.2):
+        """
+        Initializes the RateLimiter object.
+
+        Args:
+            data_dir: The directory holding the cts-cli local data.
+            rate: The number of requests allowed per minute, 0 for no limit.
+            daily_quota: The number of requests allowed per day, 0 for no limit.
+            reserve: The share of the budget kept for interactive requests.
+
+        Returns:
+            None
+        """
+        os.makedirs(data_dir, exist_ok=True)
+        self.state_path = os.path.join(data_dir, QUOTA_STATE_FILE)
+        self.lock_path = os.path.join(data_dir, QUOTA_LOCK_FILE)
+        self.rate = rate
+        self.daily_quota = daily_quota
+        self.reserve = reserve
+
+    @contextmanager
+    def _state(self):
+        """
+        Lock, load and then save the shared limiter state.
+
+        Returns:
+            dict: The state, saved back when the context exits.
+        """
+        with open(self.lock_path, "a", encoding="utf-8") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.state_path, encoding="utf-8") as state_file:
+                        state = json.load(state_file)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    state = {}
+                state.setdefault("tokens", float(self.rate))
+                state.setdefault("updated", time.time())
+                state.setdefault("counters", {})
+                yield state
+                tmp_path = f"{self.state_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as state_file:
+                    json.dump(state, state_file)
+                os.replace(tmp_path, self.state_path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _refill(self, state: dict):
+        """
+        Add the tokens earned since the last update to the bucket.
+
+        Args:
+            state (dict): The limiter state.
+
+        Returns:
+            None
+        """
+        now = time.time()
+        earned = (now - state["updated"]) * self.rate / 60
+        state["tokens"] = min(float(self.rate), state["tokens"] + earned)
+        state["updated"] = now
+
+    def acquire(self, endpoint: str, priority: str = INTERACTIVE):
+        """
+        Wait until a request to the endpoint is allowed, then count it.
+
+        Args:
+            endpoint (str): The API endpoint about to be requested.
+            priority (str): INTERACTIVE or BACKGROUND.
+
+        Returns:
+            None
+
+        Raises:
+            QuotaExceededError: If the daily quota is spent for this priority.
+        """
+        reserved = 0 if priority == INTERACTIVE else self.reserve
+        while True:
+            with self._state() as state:
+                today = date.today().isoformat()
+                counters = state["counters"].setdefault(today, {})
+                if self.daily_quota and sum(counters.values()) >= self.daily_quota * (
+                    1 - reserved
+                ):
+                    raise QuotaExceededError(
+                        f"Daily quota of {self.daily_quota} requests reached "
+                        f"for {priority} requests."
+                    )
+                self._refill(state)
+                floor = self.rate * reserved
+                if self.rate <= 0 or state["tokens"] - 1 >= floor:
+                    state["tokens"] = max(state["tokens"] - 1, 0)
+                    counters[endpoint] = counters.get(endpoint, 0) + 1
+                    for day in sorted(state["counters"])[:-QUOTA_HISTORY_DAYS]:
+                        del state["counters"][day]
+                    return
+                wait = (floor + 1 - state["tokens"]) * 60 / self.rate
+            time.sleep(wait)
+
+    def usage(self) -> tuple[float, dict]:
+        """
+        Get the remaining tokens and the per endpoint request counters.
+
+        Returns:
+            tuple[float, dict]: The tokens left in the bucket and the counters \
+by day and endpoint.
+        """
+        with self._state() as state:
+            self._refill(state)
+            return state["tokens"], state["counters"]
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Staggered polling scheduler."""
+import heapq
+from threading import Event, Thread
+import time
+
+
+class FetchScheduler:
+    """
+    Runs polling jobs one at a time from a single background thread.
+
+    Every job runs once per `interval` seconds, and the jobs are staggered
+    evenly over the interval so that requests are spread instead of bursting.
+
+    Args:
+        jobs: The callables to run, without arguments.
+        interval: The number of seconds between two runs of a job.
+        on_error: Called with the job index and the exception when a job \
+fails, the other jobs keep running.
+        clock: The monotonic clock giving the current time in seconds.
+
+    Methods:
+        start: Starts the scheduler thread.
+        stop: Stops the scheduler thread after the running job.
+    """
+
+    def __init__(self, jobs, interval=30, on_error=None, clock=time.monotonic):
+        """
+        Initializes the FetchScheduler object.
+
+        Args:
+            jobs: The callables to run, without arguments.
+            interval: The number of seconds between two runs of a job.
+            on_error: Called with the job index and the exception when a job \
+fails, the other jobs keep running.
+            clock: The monotonic clock giving the current time in seconds.
+
+        Returns:
+            None
+        """
+        self.jobs = jobs
+        self.interval = interval
+        self.on_error = on_error
+        self.clock = clock
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """
+        Starts the scheduler thread.
+
+        Returns:
+            None
+        """
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the scheduler thread after the running job.
+
+        Returns:
+            None
+        """
+        self._stopped.set()
+
+    def _run(self):
+        """
+        Runs the due jobs until the scheduler is stopped.
+
+        Returns:
+            None
+        """
+        now = self.clock()
+        step = self.interval / max(len(self.jobs), 1)
+        queue = [(now + i * step, i) for i in range(len(self.jobs))]
+        while queue and not self._stopped.is_set():
+            due, i = heapq.heappop(queue)
+            if self._stopped.wait(max(due - self.clock(), 0)):
+                break
+            try:
+                self.jobs[i]()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                if self.on_error:
+                    self.on_error(i, e)
+            # keep the stagger even if a job ran late
+            heapq.heappush(queue, (max(due + self.interval, self.clock()), i))
@@ -4,9 +4,16 @@ from prompt_toolkit import prompt
 from prompt_toolkit.completion import WordCompleter
 
 
-def suggester(prompt_txt: str, response_json: dict):
-    """Provide input suggestions or autocomplete functionality."""
-    suggestions = collect_sation_names(response_json)
+def suggester(
+    prompt_txt: str, response_json: dict = None, names: list = None, counts: dict = None
+):
+    """Provide input suggestions, most queried stations first."""
+    suggestions = collect_sation_names(response_json) if names is None else names
+    if counts:
+        counts = {name.casefold(): count for name, count in counts.items()}
+        suggestions = sorted(
+            suggestions, key=lambda name: -counts.get(name.casefold(), 0)
+        )
     completer = WordCompleter(suggestions, ignore_case=True)
     return prompt(prompt_txt, completer=completer)
 
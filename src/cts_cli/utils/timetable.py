@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""Compact connection timetable and journey planner."""
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+import json
+import os
+import struct
+from typing import NamedTuple, Sequence
+
+TIMETABLE_INDEX_FILE = "timetable.bin"
+TIMETABLE_META_FILE = "timetable.json"
+TIMETABLE_MAGIC = b"CTST"
+TIMETABLE_VERSION = 1
+HEADER = struct.Struct("<4sII")
+MIN_TRANSFER_TIME = 60
+
+
+class Connections(NamedTuple):
+    """The connections columns, in file order."""
+
+    dep_stations: Sequence[int]
+    arr_stations: Sequence[int]
+    dep_times: Sequence[int]
+    arr_times: Sequence[int]
+    dep_trips: Sequence[int]
+
+
+def get_call_time(call: dict, *fields: str):
+    """
+    Get the first available time of a call, as seconds since epoch.
+
+    Args:
+        call (dict): An EstimatedCall.
+        fields (str): The time fields to try, in order.
+
+    Returns:
+        int: The timestamp, or None if no field is set.
+    """
+    for field in fields:
+        if call.get(field):
+            return int(datetime.fromisoformat(call[field]).timestamp())
+    return None
+
+
+def compile_timetable(estimated_time_data: dict, data_dir: str) -> int:
+    """
+    Compile an estimated timetable into connections sorted by departure time.
+
+    A connection links two successive calls of a vehicle journey. Stop points
+    sharing a name are merged into one station, like `get_station_ref` does.
+
+    Args:
+        estimated_time_data (dict): The estimated timetable JSON response.
+        data_dir (str): The directory holding the cts-cli local data.
+
+    Returns:
+        int: The number of connections.
+    """
+    stations, trips, connections = {}, [], []
+    for timetable in estimated_time_data["ServiceDelivery"][
+        "EstimatedTimetableDelivery"
+    ]:
+        for frame in timetable["EstimatedJourneyVersionFrame"]:
+            for journey in frame.get("EstimatedVehicleJourney", []):
+                connections.extend(
+                    get_journey_connections(journey, stations, len(trips))
+                )
+                trips.append(
+                    [journey.get("LineRef", ""), journey.get("DestinationName", "")]
+                )
+    connections.sort()
+
+    os.makedirs(data_dir, exist_ok=True)
+    index_path = os.path.join(data_dir, TIMETABLE_INDEX_FILE)
+    with open(f"{index_path}.tmp", "wb") as index_file:
+        write_timetable_columns(index_file, connections)
+    os.replace(f"{index_path}.tmp", index_path)
+
+    meta_path = os.path.join(data_dir, TIMETABLE_META_FILE)
+    with open(f"{meta_path}.tmp", "w", encoding="utf-8") as meta_file:
+        json.dump(
+            {
+                "stations": [name for _, name in sorted(stations.values())],
+                "trips": trips,
+            },
+            meta_file,
+        )
+    os.replace(f"{meta_path}.tmp", meta_path)
+    return len(connections)
+
+
+def get_journey_connections(journey: dict, stations: dict, trip: int) -> list:
+    """
+    Get the connections between the successive calls of a vehicle journey.
+
+    Args:
+        journey (dict): An EstimatedVehicleJourney.
+        stations (dict): The (index, name) of the stations by casefolded name, \
+filled with the journey ones.
+        trip (int): The trip index of the journey.
+
+    Returns:
+        list: The connections as (departure, arrival, from station, to station, \
+trip) tuples.
+    """
+    connections = []
+    previous_station, previous_departure = None, None
+    for call in journey["EstimatedCalls"]:
+        name = call["StopPointName"]
+        station = stations.setdefault(name.casefold(), (len(stations), name))[0]
+        arrival = get_call_time(
+            call,
+            "ExpectedArrivalTime",
+            "AimedArrivalTime",
+            "ExpectedDepartureTime",
+            "AimedDepartureTime",
+        )
+        if (
+            previous_departure is not None
+            and arrival is not None
+            and arrival >= previous_departure
+            and station != previous_station
+        ):
+            connections.append(
+                (previous_departure, arrival, previous_station, station, trip)
+            )
+        previous_station = station
+        previous_departure = get_call_time(
+            call,
+            "ExpectedDepartureTime",
+            "AimedDepartureTime",
+            "ExpectedArrivalTime",
+            "AimedArrivalTime",
+        )
+    return connections
+
+
+def write_timetable_columns(index_file, connections: list):
+    """
+    Write the header and the columns of the binary timetable.
+
+    Args:
+        index_file: The binary file to write to.
+        connections (list): The connections sorted by departure time.
+
+    Returns:
+        None
+    """
+    columns = Connections(*(array("I") for _ in Connections._fields))
+    for dep_time, arr_time, dep_station, arr_station, trip in connections:
+        columns.dep_stations.append(dep_station)
+        columns.arr_stations.append(arr_station)
+        columns.dep_times.append(dep_time)
+        columns.arr_times.append(arr_time)
+        columns.dep_trips.append(trip)
+    index_file.write(HEADER.pack(TIMETABLE_MAGIC, TIMETABLE_VERSION, len(connections)))
+    for column in columns:
+        column.tofile(index_file)
+
+
+class Timetable:
+    """
+    The compiled connections, stored as parallel arrays.
+
+    Args:
+        data_dir: The directory holding the cts-cli local data.
+
+    Attributes:
+        stations: The station names, in index order.
+        trips: The line and destination of each trip.
+        connections: The connections columns, sorted by departure time.
+
+    Methods:
+        age: Gets the age of the compiled timetable of a directory.
+        station_id: Resolves a station name.
+        route: Plans the earliest arrival journey between two stations.
+    """
+
+    def __init__(self, data_dir):
+        """
+        Loads the compiled timetable of the given directory.
+
+        Args:
+            data_dir: The directory holding the cts-cli local data.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the file is not a compatible compiled timetable.
+        """
+        meta_path = os.path.join(data_dir, TIMETABLE_META_FILE)
+        with open(meta_path, encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        self.stations = meta["stations"]
+        self.trips = meta["trips"]
+        self._station_ids = {name.casefold(): i for i, name in enumerate(self.stations)}
+
+        with open(os.path.join(data_dir, TIMETABLE_INDEX_FILE), "rb") as index_file:
+            magic, version, count = HEADER.unpack(index_file.read(HEADER.size))
+            if magic != TIMETABLE_MAGIC or version != TIMETABLE_VERSION:
+                raise ValueError("Incompatible timetable, run with --refresh.")
+            columns = []
+            for _ in Connections._fields:
+                columns.append(array("I"))
+                columns[-1].fromfile(index_file, count)
+        self.connections = Connections(*columns)
+
+    @staticmethod
+    def age(data_dir: str) -> float:
+        """
+        Get the age in seconds of the compiled timetable, None if missing.
+        """
+        index_path = os.path.join(data_dir, TIMETABLE_INDEX_FILE)
+        if not os.path.exists(index_path):
+            return None
+        return datetime.now().timestamp() - os.path.getmtime(index_path)
+
+    def station_id(self, name: str) -> int:
+        """
+        Resolve a station name (case insensitive) to its index, None if unknown.
+        """
+        return self._station_ids.get(name.casefold())
+
+    def route(self, origin: int, destination: int, depart: int) -> list[tuple]:
+        """
+        Plan the earliest arrival journey with the connection scan algorithm.
+
+        Args:
+            origin (int): The origin station index.
+            destination (int): The destination station index.
+            depart (int): The earliest departure, in seconds since epoch.
+
+        Returns:
+            list[tuple]: The legs as (trip, from station, departure, to station, \
+arrival) tuples, empty if the destination can not be reached.
+        """
+        arrived_by = self._scan(origin, destination, depart)
+        if destination not in arrived_by or origin == destination:
+            return []
+        connections = self.connections
+        legs = []
+        station = destination
+        while station != origin:
+            board, alight = arrived_by[station]
+            station = connections.dep_stations[board]
+            legs.append(
+                (
+                    connections.dep_trips[board],
+                    station,
+                    connections.dep_times[board],
+                    connections.arr_stations[alight],
+                    connections.arr_times[alight],
+                )
+            )
+        return legs[::-1]
+
+    def _scan(self, origin: int, destination: int, depart: int) -> dict:
+        """
+        Scan the connections departing after `depart` until the destination
+        can not be reached earlier.
+
+        Args:
+            origin (int): The origin station index.
+            destination (int): The destination station index.
+            depart (int): The earliest departure, in seconds since epoch.
+
+        Returns:
+            dict: The (boarding, alighting) connection indexes of the earliest \
+arrival at each reached station.
+        """
+        connections = self.connections
+        earliest = [2**32] * len(self.stations)
+        earliest[origin] = depart - MIN_TRANSFER_TIME
+        boarded = {}
+        arrived_by = {}
+        for i in range(
+            bisect_left(connections.dep_times, depart), len(connections.dep_times)
+        ):
+            if earliest[destination] <= connections.dep_times[i]:
+                break
+            trip = connections.dep_trips[i]
+            if trip not in boarded:
+                # a transfer time is needed to board a new trip
+                if (
+                    earliest[connections.dep_stations[i]] + MIN_TRANSFER_TIME
+                    > connections.dep_times[i]
+                ):
+                    continue
+                boarded[trip] = i
+            arr_station = connections.arr_stations[i]
+            if connections.arr_times[i] < earliest[arr_station]:
+                earliest[arr_station] = connections.arr_times[i]
+                arrived_by[arr_station] = (boarded[trip], i)
+        return arrived_by
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# pylint: skip-file
+"""Cache and prefetch test module."""
+from unittest.mock import Mock, patch
+from click.testing import CliRunner
+from requests import ConnectionError
+from cts_cli.api.departure_time import get_stop_monitoring_data, load_station_refs
+from cts_cli.cli.departure_time import departure_time
+from cts_cli.cli.prefetch import prefetch
+from cts_cli.utils.cache import (
+    get_station_query_counts,
+    open_cache,
+    record_station_query,
+    store_station_refs,
+)
+from cts_cli.utils.suggester import suggester
+
+ESTIMATED_TIMETABLE = {
+    "ServiceDelivery": {
+        "EstimatedTimetableDelivery": [
+            {
+                "EstimatedJourneyVersionFrame": [
+                    {},
+                    {
+                        "EstimatedVehicleJourney": [
+                            {
+                                "EstimatedCalls": [
+                                    {"StopPointRef": "1", "StopPointName": "Gare"},
+                                    {"StopPointRef": "2", "StopPointName": "GARE"},
+                                    {"StopPointRef": "3", "StopPointName": "Etoile"},
+                                ]
+                            }
+                        ]
+                    },
+                ]
+            }
+        ]
+    }
+}
+
+
+def test_station_query_counts(tmp_path):
+    """Test that lookups are counted case insensitively, most queried first."""
+    conn = open_cache(str(tmp_path))
+    for station in ["Gare", "Homme de Fer", "homme de fer", "Emile Mathis"]:
+        record_station_query(conn, station)
+
+    assert get_station_query_counts(conn) == {
+        "homme de fer": 2,
+        "Emile Mathis": 1,
+        "Gare": 1,
+    }
+    assert get_station_query_counts(conn, limit=1) == {"homme de fer": 2}
+    conn.close()
+
+
+def test_stop_monitoring_data_uses_warm_cache(tmp_path):
+    """Test that fresh cached responses are reused and others downloaded."""
+    ctx = Mock(obj={"data_dir": str(tmp_path), "cache_max_age": 30})
+    with patch("cts_cli.api.departure_time.api_get") as mock_api_get:
+        mock_api_get.return_value = Mock(json=lambda: {"data": "response_data"})
+
+        get_stop_monitoring_data(ctx, ["1"], max_age=0)
+        assert mock_api_get.call_count == 1
+
+        result = get_stop_monitoring_data(ctx, ["1", "2"])
+        assert result == [{"data": "response_data"}] * 2
+        assert mock_api_get.call_count == 2
+        assert mock_api_get.call_args.kwargs["params"] == {"MonitoringRef": "2"}
+
+        get_stop_monitoring_data(ctx, ["1", "2"], max_age=0)
+        assert mock_api_get.call_count == 4
+
+
+def test_station_refs_use_warm_cache(tmp_path):
+    """Test that the estimated timetable is only downloaded for stale references."""
+    ctx = Mock(obj={"data_dir": str(tmp_path)})
+    with patch("cts_cli.api.departure_time.api_get") as mock_api_get:
+        mock_api_get.return_value = Mock(json=lambda: ESTIMATED_TIMETABLE)
+
+        assert load_station_refs(ctx) == {"Gare": ["1", "2"], "Etoile": ["3"]}
+        assert load_station_refs(ctx) == {"Gare": ["1", "2"], "Etoile": ["3"]}
+        assert mock_api_get.call_count == 1
+
+        load_station_refs(ctx, max_age=0)
+        assert mock_api_get.call_count == 2
+
+
+def test_departure_time_reads_cached_station_refs(tmp_path):
+    """Test that departure-time does not download the estimated timetable again."""
+    conn = open_cache(str(tmp_path))
+    store_station_refs(conn, {"Gare": ["1"], "Etoile": ["3"]})
+    conn.close()
+    stop_monitoring = {"ServiceDelivery": {"StopMonitoringDelivery": [{}]}}
+    with patch("cts_cli.api.departure_time.api_get") as mock_api_get, patch(
+        "cts_cli.cli.departure_time.suggester", return_value="gare"
+    ) as mock_suggester:
+        mock_api_get.return_value = Mock(json=lambda: stop_monitoring)
+        result = CliRunner().invoke(departure_time, obj={"data_dir": str(tmp_path)})
+
+    assert result.exit_code == 0, result.output
+    assert mock_suggester.call_args.kwargs["names"] == ["Gare", "Etoile"]
+    mock_api_get.assert_called_once()
+    assert mock_api_get.call_args.kwargs["params"] == {"MonitoringRef": "1"}
+
+
+def test_suggester_orders_stations_by_query_counts():
+    """Test that the most queried stations are suggested first."""
+    with patch("cts_cli.utils.suggester.prompt", return_value="Gare") as mock_prompt:
+        suggester(
+            "Enter station name: ",
+            names=["Etoile", "Gare", "Homme de Fer"],
+            counts={"homme de fer": 3, "GARE": 5},
+        )
+
+    completer = mock_prompt.call_args.kwargs["completer"]
+    assert completer.words == ["Gare", "Homme de Fer", "Etoile"]
+
+
+def test_prefetch_refreshes_station_refs_and_reports_errors(tmp_path):
+    """Test that prefetch keeps the station references fresh and survives errors."""
+    conn = open_cache(str(tmp_path))
+    record_station_query(conn, "Gare")
+    conn.close()
+    obj = {"data_dir": str(tmp_path), "cache_max_age": 30}
+    with patch("cts_cli.api.departure_time.api_get") as mock_api_get:
+        mock_api_get.return_value = Mock(json=lambda: ESTIMATED_TIMETABLE)
+        result = CliRunner().invoke(prefetch, ["--once"], obj=obj)
+
+        assert result.exit_code == 0, result.output
+        assert "Refreshed 1 stations: Gare" in result.output
+        assert mock_api_get.call_args_list[0].args[1] == "/estimated-timetable"
+        assert mock_api_get.call_count == 3
+
+    conn = open_cache(str(tmp_path))
+    store_station_refs(conn, {})
+    conn.close()
+    with patch(
+        "cts_cli.api.departure_time.api_get", side_effect=ConnectionError("offline")
+    ):
+        result = CliRunner().invoke(prefetch, ["--once"], obj=obj)
+
+    assert result.exit_code == 0, result.output
+    assert "Refresh failed: offline" in result.output
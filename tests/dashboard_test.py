@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# pylint: skip-file
+"""Dashboard test module."""
+from datetime import datetime, timedelta
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+from click.testing import CliRunner
+import pytest
+from requests import ConnectionError
+
+from cts_cli.api.departures_model import DeparturesModel
+from cts_cli.cli.dashboard import dashboard, poll_station
+
+ESTIMATED_TIMETABLE = {
+    "ServiceDelivery": {
+        "EstimatedTimetableDelivery": [
+            {
+                "EstimatedJourneyVersionFrame": [
+                    {},
+                    {
+                        "EstimatedVehicleJourney": [
+                            {
+                                "EstimatedCalls": [
+                                    {"StopPointRef": "12345", "StopPointName": "A"}
+                                ]
+                            }
+                        ]
+                    },
+                ]
+            }
+        ]
+    }
+}
+
+
+def stop_monitoring(line):
+    """Build a stop monitoring response with one departure of a line."""
+    expected = (datetime.now().astimezone() + timedelta(minutes=10)).isoformat()
+    return {
+        "ServiceDelivery": {
+            "StopMonitoringDelivery": [
+                {
+                    "MonitoredStopVisit": [
+                        {
+                            "MonitoredVehicleJourney": {
+                                "LineRef": line,
+                                "DestinationName": "DestinationA",
+                                "FramedVehicleJourneyRef": {
+                                    "DatedVehicleJourneyRef": "1"
+                                },
+                                "MonitoredCall": {
+                                    "StopPointRef": "12345",
+                                    "ExpectedDepartureTime": expected,
+                                },
+                            }
+                        }
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class FakeApp:
+    """Dashboard application returning once a pane was redrawn."""
+
+    def __init__(self, boards):
+        self.boards = boards
+        self.redrawn = Event()
+
+    def invalidate(self):
+        self.redrawn.set()
+
+    def run(self):
+        assert self.redrawn.wait(timeout=5)
+
+
+def test_poll_station_renders_the_departures():
+    """Test that a poll bypasses the cache and renders the departures table."""
+    ctx = MagicMock()
+    with patch(
+        "cts_cli.cli.dashboard.get_stop_monitoring_data",
+        return_value=[stop_monitoring("LineA")],
+    ) as mock_get_stop_monitoring_data:
+        board = poll_station(ctx, ["12345"], DeparturesModel(), rows=8)
+
+    assert mock_get_stop_monitoring_data.call_args.kwargs["max_age"] == 0
+    assert board.startswith("Updated ")
+    assert "LineA" in board
+
+
+@pytest.mark.parametrize(
+    "error",
+    [ValueError("unexpected response"), KeyError("ServiceDelivery")],
+)
+def test_dashboard_shows_failed_polls_in_the_pane(error, tmp_path):
+    """Test that any poll error is shown in the pane of its station."""
+    apps = []
+
+    def build_dashboard(stations, boards):
+        apps.append(FakeApp(boards))
+        return apps[-1]
+
+    with patch("cts_cli.api.departure_time.api_get") as mock_api_get, patch(
+        "cts_cli.cli.dashboard.get_stop_monitoring_data", side_effect=error
+    ), patch("cts_cli.cli.dashboard.build_dashboard", side_effect=build_dashboard):
+        mock_api_get.return_value.json.return_value = ESTIMATED_TIMETABLE
+        result = CliRunner().invoke(
+            dashboard,
+            ["--station", "A", "--interval", "60"],
+            obj={"data_dir": str(tmp_path)},
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "Update failed" in apps[0].boards[0]
+    assert str(error) in apps[0].boards[0]
+
+
+def test_dashboard_reports_network_errors(tmp_path):
+    """Test that a failed estimated timetable download is reported."""
+    with patch(
+        "cts_cli.api.departure_time.api_get", side_effect=ConnectionError("offline")
+    ), patch("cts_cli.cli.dashboard.build_dashboard") as mock_build_dashboard:
+        result = CliRunner().invoke(
+            dashboard, ["--station", "A"], obj={"data_dir": str(tmp_path)}
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "Could not get the estimated timetable: offline" in result.output
+    mock_build_dashboard.assert_not_called()
@@ -3,7 +3,9 @@
 """Departure time function test module."""
 import pytest
 from unittest.mock import Mock, patch
+from requests import ConnectionError
 from cts_cli.api.departure_time import departure_time_call
+from cts_cli.cli.departure_time import watch_departure_time
 
 # Constants used for testing
 STOP_MONITORING_ENDPOINT = "/stopMonitoring"
@@ -12,7 +14,7 @@ TIMEOUT = 10
 
 # Test cases
 @pytest.mark.parametrize(
-    "test_id, ctx, station, estimated_time_data, expected_result",
+    "test_id, ctx, station, station_refs, expected_result",
     [
         # Happy path tests with various realistic test values
         (
@@ -25,7 +27,7 @@ TIMEOUT = 10
                 }
             ),
             "Central",
-            {"data": "dummy_data"},
+            {"Central": ["station_ref_1"]},
             "expected_departures_1",
         ),
         # Add more happy path test cases here
@@ -35,27 +37,47 @@ TIMEOUT = 10
         # Add error cases here
     ],
 )
-def test_departure_time_call(
-    test_id, ctx, station, estimated_time_data, expected_result
-):
+def test_departure_time_call(test_id, ctx, station, station_refs, expected_result):
     # Arrange
     with patch(
-        "cts_cli.api.departure_time.get_station_ref"
-    ) as mock_get_station_ref, patch(
-        "cts_cli.api.departure_time.requests.get"
-    ) as mock_requests_get, patch(
+        "cts_cli.api.departure_time.find_stations_refs"
+    ) as mock_find_stations_refs, patch(
+        "cts_cli.api.departure_time.api_get"
+    ) as mock_api_get, patch(
         "cts_cli.api.departure_time.get_station_departures"
     ) as mock_get_station_departures:
         # Setup mock return values
-        mock_get_station_ref.return_value = ["station_ref_1"]
-        mock_requests_get.return_value = Mock(json=lambda: {"data": "response_data"})
+        mock_find_stations_refs.return_value = ["station_ref_1", "station_ref_1"]
+        mock_api_get.return_value = Mock(json=lambda: {"data": "response_data"})
         mock_get_station_departures.return_value = expected_result
 
         # Act
-        result = departure_time_call(ctx, station, estimated_time_data)
+        result = departure_time_call(ctx, station, station_refs)
 
         # Assert
         assert result == expected_result
-        mock_get_station_ref.assert_called_once_with(estimated_time_data, station)
-        mock_requests_get.assert_called_once()
+        mock_find_stations_refs.assert_called_once_with(station_refs, [station])
+        mock_api_get.assert_called_once_with(
+            ctx,
+            "/stop-monitoring",
+            params={"MonitoringRef": "station_ref_1"},
+            priority="interactive",
+        )
         mock_get_station_departures.assert_called_once_with([{"data": "response_data"}])
+
+
+def test_watch_departure_time_shows_failed_polls(capsys):
+    """Test that a failed poll is reported and the watch keeps going."""
+    with patch(
+        "cts_cli.cli.departure_time.find_stations_refs", return_value=["station_ref_1"]
+    ), patch(
+        "cts_cli.cli.departure_time.get_stop_monitoring_data",
+        side_effect=ConnectionError("network down"),
+    ) as mock_get_stop_monitoring_data, patch(
+        "cts_cli.cli.departure_time.time.sleep",
+        side_effect=[None, KeyboardInterrupt],
+    ):
+        watch_departure_time(Mock(obj={}), "Central", {}, interval=1)
+
+    assert mock_get_stop_monitoring_data.call_count == 2
+    assert capsys.readouterr().out.count("Update failed: network down") == 2
@@ -3,7 +3,12 @@
 """Departure time test module."""
 from datetime import datetime, timedelta
 import pytest
-from cts_cli.api.departure_time import get_station_ref, get_station_departures
+from cts_cli.api.departure_time import (
+    collect_station_refs,
+    find_stations_refs,
+    get_station_ref,
+    get_station_departures,
+)
 
 
 future_datetime = datetime.now() + timedelta(minutes=5)
@@ -189,6 +194,25 @@ def test_get_station_ref_happy_path(test_id, json_response, station_name, expect
     assert result == expected, f"Failed {test_id}"
 
 
+@pytest.mark.parametrize(
+    "station_names, expected",
+    [
+        (["StationA"], ["12345", "67890", "54321"]),
+        (["StationC", "stationa"], ["09876", "12345", "67890", "54321"]),
+        (["StationD"], []),
+    ],
+)
+def test_find_stations_refs(station_names, expected):
+    """Test find_stations_refs drops the duplicated references."""
+    # Act
+    result = find_stations_refs(
+        collect_station_refs(happy_path_cases[1][1]), station_names
+    )
+
+    # Assert
+    assert result == expected
+
+
 # @pytest.mark.parametrize("test_id, json_response, station_name, expected_exception", edge_cases)
 # def test_get_station_ref_edge_cases(test_id, json_response, station_name, expected_exception):
 #     # Act & Assert
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# pylint: skip-file
+"""Departures model test module."""
+from datetime import datetime, timedelta
+from cts_cli.api.departures_model import (
+    INSERT,
+    REMOVE,
+    UPDATE,
+    DeparturesModel,
+    describe_change,
+)
+
+
+def at(minutes):
+    """Get an ISO datetime string in the given number of minutes."""
+    return (datetime.now().astimezone() + timedelta(minutes=minutes)).isoformat()
+
+
+def stop_monitoring(*visits):
+    """Build a stop monitoring response from (journey, line, expected) tuples."""
+    return {
+        "ServiceDelivery": {
+            "StopMonitoringDelivery": [
+                {
+                    "MonitoredStopVisit": [
+                        {
+                            "MonitoringRef": "12345",
+                            "MonitoredVehicleJourney": {
+                                "LineRef": line,
+                                "DestinationName": "DestinationA",
+                                "FramedVehicleJourneyRef": {
+                                    "DatedVehicleJourneyRef": journey
+                                },
+                                "MonitoredCall": {"ExpectedDepartureTime": expected},
+                            },
+                        }
+                        for journey, line, expected in visits
+                    ]
+                }
+            ]
+        }
+    }
+
+
+def test_first_poll_inserts_sorted_rows():
+    """Test that the first poll inserts every departure in time order."""
+    model = DeparturesModel()
+    changes = model.apply([stop_monitoring(("1", "A", at(10)), ("2", "B", at(5)))])
+
+    assert [kind for kind, *_ in changes] == [INSERT, INSERT]
+    assert [row[0] for row in model.rows()] == ["B", "A"]
+
+
+def test_successive_polls_only_emit_changes():
+    """Test that unchanged departures are skipped and others updated or removed."""
+    model = DeparturesModel()
+    first_a, first_b = at(10), at(5)
+    model.apply([stop_monitoring(("1", "A", first_a), ("2", "B", first_b))])
+
+    assert (
+        model.apply([stop_monitoring(("1", "A", first_a), ("2", "B", first_b))]) == []
+    )
+
+    changes = model.apply([stop_monitoring(("2", "B", at(12)), ("3", "C", at(1)))])
+    assert [(kind, key[0]) for kind, key, _, _ in changes] == [
+        (UPDATE, "2"),
+        (INSERT, "3"),
+        (REMOVE, "1"),
+    ]
+    assert describe_change(changes[0]) == "Line B to DestinationA: +7 min delay"
+    assert [row[0] for row in model.rows()] == ["C", "B"]
+    assert [row[0] for row in model.rows(limit=1)] == ["C"]
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# pylint: skip-file
+"""GTFS index test module."""
+from datetime import datetime, timedelta
+import os
+from unittest.mock import patch
+import zipfile
+import pytest
+from click.testing import CliRunner
+from requests import ConnectionError
+from cts_cli.api.schedule import overlay_departures
+from cts_cli.cli.departure_time import departure_time
+from cts_cli.utils import gtfs
+from cts_cli.utils.gtfs import (
+    GtfsIndex,
+    compile_gtfs,
+    parse_gtfs_time,
+    read_gtfs_table,
+)
+
+FEED = {
+    "stops.txt": "stop_id,stop_name\n1,Homme de Fer\n2,Homme de Fer\n3,Emile Mathis\n",
+    "routes.txt": "route_id,route_short_name\nR_A,A\nR_B,B\n",
+    "trips.txt": "trip_id,route_id,service_id,trip_headsign\n"
+    "t1,R_A,WEEK,Graffenstaden\n"
+    "t2,R_B,WEEK,Lingolsheim\n"
+    "t3,R_A,SUNDAY,Graffenstaden\n"
+    "t4,R_A,WEEK,Parc des Sports\n",
+    "stop_times.txt": "trip_id,departure_time,stop_id\n"
+    "t1,08:10:00,1\n"
+    "t1,08:15:00,3\n"
+    "t2,08:05:00,2\n"
+    "t3,08:07:00,1\n"
+    "t4,24:30:00,1\n",
+    "calendar.txt": "service_id,monday,tuesday,wednesday,thursday,friday,"
+    "saturday,sunday,start_date,end_date\n"
+    "WEEK,1,1,1,1,1,0,0,20240101,20241231\n"
+    "SUNDAY,0,0,0,0,0,0,1,20240101,20241231\n",
+    "calendar_dates.txt": "service_id,date,exception_type\nWEEK,20240227,2\n",
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Compile the test feed and open its index."""
+    feed = tmp_path / "feed"
+    feed.mkdir()
+    for name, content in FEED.items():
+        (feed / name).write_text(content)
+    assert compile_gtfs(str(feed), str(tmp_path)) == (2, 5)
+    gtfs_index = GtfsIndex(str(tmp_path))
+    yield gtfs_index
+    gtfs_index.close()
+
+
+def test_parse_gtfs_time():
+    """Test that GTFS times past midnight are supported."""
+    assert parse_gtfs_time("25:10:00") == 90600
+
+
+def test_departures_merge_stops_and_filter_services(index):
+    """Test that stops sharing a name are merged and calendars applied."""
+    monday = datetime(2024, 2, 26, 8, 0)
+    assert index.departures("homme de fer", monday) == [
+        (datetime(2024, 2, 26, 8, 5), "B", "Lingolsheim"),
+        (datetime(2024, 2, 26, 8, 10), "A", "Graffenstaden"),
+        (datetime(2024, 2, 27, 0, 30), "A", "Parc des Sports"),
+    ]
+    assert index.departures("homme de fer", monday, limit=1) == [
+        (datetime(2024, 2, 26, 8, 5), "B", "Lingolsheim"),
+    ]
+    assert index.departures("Unknown", monday) == []
+
+
+def test_departures_calendar_exceptions_and_after_midnight(index):
+    """Test removed dates and trips of the previous service day."""
+    # the WEEK service is removed on tuesday 27, but the 24:30 trip of monday runs
+    assert index.departures("Homme de Fer", datetime(2024, 2, 27, 0, 10)) == [
+        (datetime(2024, 2, 27, 0, 30), "A", "Parc des Sports"),
+    ]
+    sunday = datetime(2024, 2, 25, 8, 0)
+    assert index.departures("Homme de Fer", sunday) == [
+        (datetime(2024, 2, 25, 8, 7), "A", "Graffenstaden"),
+    ]
+
+
+def test_read_gtfs_table_streams_zip_feeds(tmp_path):
+    """Test that zipped tables are streamed and missing tables are empty."""
+    feed = tmp_path / "feed.zip"
+    with zipfile.ZipFile(feed, "w") as archive:
+        for name, content in FEED.items():
+            archive.writestr(name, content)
+
+    rows = read_gtfs_table(str(feed), "stop_times.txt")
+    assert next(rows) == {"trip_id": "t1", "departure_time": "08:10:00", "stop_id": "1"}
+    assert len(list(rows)) == 4
+    assert list(read_gtfs_table(str(feed), "shapes.txt")) == []
+    assert compile_gtfs(str(feed), str(tmp_path)) == (2, 5)
+
+
+def test_compile_gtfs_rejects_overflowing_columns(tmp_path, monkeypatch):
+    """Test that more names than a 16-bit column holds is a clear error."""
+    monkeypatch.setattr(gtfs, "MAX_COLUMN_ID", 1)
+    feed = tmp_path / "feed"
+    feed.mkdir()
+    for name, content in FEED.items():
+        (feed / name).write_text(content)
+
+    with pytest.raises(ValueError, match="more than 2 headsigns"):
+        compile_gtfs(str(feed), str(tmp_path))
+
+
+@pytest.mark.parametrize("damage", ["missing-meta", "truncated-index", "empty-index"])
+def test_departure_time_falls_back_on_broken_index(tmp_path, damage):
+    feed = tmp_path / "feed"
+    feed.mkdir()
+    for name, content in FEED.items():
+        (feed / name).write_text(content)
+    compile_gtfs(str(feed), str(tmp_path))
+    index_path = tmp_path / gtfs.GTFS_INDEX_FILE
+    if damage == "missing-meta":
+        os.remove(tmp_path / gtfs.GTFS_META_FILE)
+    elif damage == "truncated-index":
+        index_path.write_bytes(index_path.read_bytes()[:-5])
+    else:
+        index_path.write_bytes(b"")
+    with patch(
+        "cts_cli.api.departure_time.api_get",
+        side_effect=ConnectionError("offline"),
+    ) as mock_api_get:
+        result = CliRunner().invoke(
+            departure_time, obj={"data_dir": str(tmp_path)}, catch_exceptions=False
+        )
+    assert "run `cts-cli gtfs import FEED` again" in result.output
+    assert "Could not get the estimated timetable: offline" in result.output
+    mock_api_get.assert_called_once()
+
+
+def test_overlay_departures():
+    """Test that real-time departures replace the matching scheduled ones."""
+    now = datetime.now().replace(second=0, microsecond=0)
+    scheduled = [
+        (now + timedelta(minutes=5), "A", "Graffenstaden"),
+        (now + timedelta(minutes=10), "B", "Lingolsheim"),
+    ]
+    realtime = [
+        {
+            "ServiceDelivery": {
+                "StopMonitoringDelivery": [
+                    {
+                        "MonitoredStopVisit": [
+                            {
+                                "MonitoredVehicleJourney": {
+                                    "LineRef": "A",
+                                    "DestinationName": "Graffenstaden",
+                                    "MonitoredCall": {
+                                        "AimedDepartureTime": (
+                                            now + timedelta(minutes=5)
+                                        )
+                                        .astimezone()
+                                        .isoformat(),
+                                        "ExpectedDepartureTime": (
+                                            now + timedelta(minutes=7)
+                                        )
+                                        .astimezone()
+                                        .isoformat(),
+                                    },
+                                }
+                            }
+                        ]
+                    }
+                ]
+            }
+        }
+    ]
+
+    rows = overlay_departures(scheduled, realtime)
+    assert [(row[0], row[2].endswith(" *")) for row in rows] == [
+        ("A", False),
+        ("B", True),
+    ]
+    assert [row[0] for row in overlay_departures(scheduled, [])] == ["A", "B"]
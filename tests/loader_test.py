@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# pylint: skip-file
+"""Loader test module."""
+from cts_cli.utils.loader import Loader
+
+
+def test_loader_stops_when_not_in_a_terminal(capsys):
+    """Test that the animation thread ends, each call, when stdout is not a TTY."""
+    loader = Loader(timeout=0.01)
+
+    @loader
+    def work():
+        return "done"
+
+    for _ in range(2):
+        assert work() == "done"
+        loader._thread.join(timeout=1)
+
+        assert loader.done
+        assert not loader._thread.is_alive()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# pylint: skip-file
+"""Mock SIRI server and load test module."""
+from types import SimpleNamespace
+import pytest
+import requests
+from click.testing import CliRunner
+from cts_cli.api.departure_time import get_station_departures, get_station_ref
+from cts_cli.cli.loadtest import loadtest as loadtest_command
+from cts_cli.utils import loadtest
+from cts_cli.utils.loadtest import percentile, run_load_test
+from cts_cli.utils.mock_server import MockNetwork, MockSiriServer
+from cts_cli.utils.quota import QUOTA_STATE_FILE, RateLimiter
+
+
+@pytest.fixture
+def server():
+    """Serve a small network."""
+    mock_server = MockSiriServer(MockNetwork(lines=2, stops=4, stops_per_line=4))
+    mock_server.start()
+    yield mock_server
+    mock_server.stop()
+
+
+@pytest.mark.parametrize(
+    "test_id, values, share, expected",
+    [
+        ("median", [4, 1, 3, 2], 0.5, 2),
+        ("p90", list(range(1, 11)), 0.9, 9),
+        ("single", [7], 0.99, 7),
+    ],
+)
+def test_percentile(test_id, values, share, expected):
+    """Test percentile."""
+    assert percentile(values, share) == expected, f"Failed {test_id}"
+
+
+def test_mock_server_answers_siri_requests(server):
+    """Test that the mock server timetable and stop monitoring are consistent."""
+    estimated_time_data = requests.get(
+        f"{server.url}/estimated-timetable", timeout=5
+    ).json()
+    station = estimated_time_data["ServiceDelivery"]["EstimatedTimetableDelivery"][0][
+        "EstimatedJourneyVersionFrame"
+    ][1]["EstimatedVehicleJourney"][0]["EstimatedCalls"][0]["StopPointName"]
+    station_refs = set(get_station_ref(estimated_time_data, station))
+    responses_json = [
+        requests.get(
+            f"{server.url}/stop-monitoring",
+            params={"MonitoringRef": station_ref},
+            timeout=5,
+        ).json()
+        for station_ref in station_refs
+    ]
+    assert get_station_departures(responses_json)
+
+
+def test_mock_server_error_rate(server):
+    """Test that the mock server fails at the configured error rate."""
+    server.error_rate = 1.0
+    response = requests.get(f"{server.url}/stop-monitoring", timeout=5)
+    assert response.status_code == 503
+
+
+def test_run_load_test(server):
+    """Test that the load test reports every operation."""
+    report = run_load_test(server.url, queries=4, concurrency=2)
+
+    assert report["stations"] == 4
+    assert [operation[0] for operation in report["operations"]] == [
+        "estimated-timetable",
+        "collect_sation_names",
+        "get_station_ref",
+        "departure query",
+    ]
+    assert report["operations"][-1][1:3] == [4, 0]
+
+
+def test_run_load_test_through_the_shared_rate_limiter(server, tmp_path):
+    """Test that the load test can spend the rate limiter of a data directory."""
+    limits = {"rate_limit": 600, "daily_quota": 0, "data_dir": str(tmp_path)}
+    report = run_load_test(server.url, queries=2, concurrency=2, limits=limits)
+
+    assert report["operations"][-1][1:3] == [2, 0]
+    _, counters = RateLimiter(str(tmp_path)).usage()
+    (endpoints,) = counters.values()
+    assert endpoints["/estimated-timetable"] == 1
+    assert endpoints["/stop-monitoring"] >= 2
+
+
+@pytest.mark.parametrize(
+    "args, mode",
+    [
+        ([], "with no rate limit"),
+        (["--rate-limit"], "with the shared rate limit of 600 requests per minute"),
+    ],
+)
+def test_loadtest_reports_its_mode_and_memory(tmp_path, args, mode):
+    """Test that the report tells the rate limit mode and what the memory covers."""
+    obj = {"rate_limit": 600, "daily_quota": 0, "data_dir": str(tmp_path)}
+    result = CliRunner().invoke(
+        loadtest_command,
+        ["--stops", "4", "--lines", "2", "--stops-per-line", "4", "--latency", "0"]
+        + ["--jitter", "0", "--queries", "2", "--concurrency", "2", *args],
+        obj=obj,
+    )
+
+    assert result.exit_code == 0, result.output
+    assert mode in result.output
+    assert "peak memory with the mock server" in result.output
+    assert (tmp_path / QUOTA_STATE_FILE).exists() == bool(args)
+
+
+@pytest.mark.parametrize(
+    "platform, ru_maxrss, expected",
+    [("linux", 2048, 2048), ("darwin", 2048 * 1024, 2048)],
+)
+def test_get_max_rss_is_in_kilobytes(monkeypatch, platform, ru_maxrss, expected):
+    """Test that the peak memory unit does not depend on the platform."""
+    monkeypatch.setattr(loadtest.sys, "platform", platform)
+    monkeypatch.setattr(
+        loadtest.resource, "getrusage", lambda _: SimpleNamespace(ru_maxrss=ru_maxrss)
+    )
+    assert loadtest.get_max_rss() == expected
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# pylint: skip-file
+"""Rate limiter and quota test module."""
+from datetime import date
+from unittest.mock import patch
+import pytest
+from cts_cli.utils.quota import (
+    BACKGROUND,
+    INTERACTIVE,
+    QuotaExceededError,
+    RateLimiter,
+)
+
+
+def test_acquire_counts_requests_per_endpoint(tmp_path):
+    """Test that requests are counted per endpoint and persisted."""
+    limiter = RateLimiter(str(tmp_path), rate=60)
+    limiter.acquire("/stop-monitoring")
+    limiter.acquire("/stop-monitoring")
+    limiter.acquire("/estimated-timetable")
+
+    tokens, counters = RateLimiter(str(tmp_path), rate=60).usage()
+    assert counters == {
+        date.today().isoformat(): {"/stop-monitoring": 2, "/estimated-timetable": 1}
+    }
+    assert 56 < tokens < 58
+
+
+def test_background_requests_leave_reserve(tmp_path):
+    """Test that background requests wait when only the reserve is left."""
+    limiter = RateLimiter(str(tmp_path), rate=10, reserve=0.5)
+    for _ in range(5):
+        limiter.acquire("/stop-monitoring", BACKGROUND)
+    with patch("cts_cli.utils.quota.time.sleep", side_effect=InterruptedError) as sleep:
+        with pytest.raises(InterruptedError):
+            limiter.acquire("/stop-monitoring", BACKGROUND)
+    assert sleep.call_args.args[0] == pytest.approx(6, abs=0.1)
+
+    # interactive requests can still use the reserve
+    limiter.acquire("/stop-monitoring", INTERACTIVE)
+
+
+def test_daily_quota(tmp_path):
+    """Test that the daily quota keeps a reserve for interactive requests."""
+    limiter = RateLimiter(str(tmp_path), rate=60, daily_quota=4, reserve=0.5)
+    limiter.acquire("/stop-monitoring", BACKGROUND)
+    limiter.acquire("/stop-monitoring", BACKGROUND)
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire("/stop-monitoring", BACKGROUND)
+    limiter.acquire("/stop-monitoring", INTERACTIVE)
+    limiter.acquire("/stop-monitoring", INTERACTIVE)
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire("/stop-monitoring", INTERACTIVE)
+
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_zero_rate_means_no_limit(tmp_path, rate):
+    """Test that a rate of 0 or less never waits but still counts requests."""
+    limiter = RateLimiter(str(tmp_path), rate=rate)
+    with patch("cts_cli.utils.quota.time.sleep", side_effect=InterruptedError):
+        for _ in range(100):
+            limiter.acquire("/stop-monitoring", BACKGROUND)
+
+    _, counters = limiter.usage()
+    assert counters == {date.today().isoformat(): {"/stop-monitoring": 100}}
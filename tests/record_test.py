@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+# pylint: skip-file
+"""Delay recording test module."""
+import time
+from unittest.mock import patch
+from click.testing import CliRunner
+import pytest
+from requests import ConnectionError
+from cts_cli.api.departures_model import DeparturesModel
+from cts_cli.api.record import get_change_records, get_vehicle_journey_ref
+from cts_cli.cli.record import record
+from cts_cli.display.stats import display_delay_stats
+from cts_cli.utils.delay_store import (
+    insert_delay_records,
+    open_delay_store,
+    query_delay_stats,
+)
+
+
+def stop_visit(journey_ref, line, aimed, expected, stop_ref="12345"):
+    """Build a MonitoredStopVisit."""
+    return {
+        "MonitoringRef": stop_ref,
+        "MonitoredVehicleJourney": {
+            "LineRef": line,
+            "DestinationName": "DestinationA",
+            "FramedVehicleJourneyRef": {
+                "DataFrameRef": "2024-02-24",
+                "DatedVehicleJourneyRef": journey_ref,
+            },
+            "MonitoredCall": {
+                "StopPointName": "StationA",
+                "AimedDepartureTime": aimed,
+                "ExpectedDepartureTime": expected,
+            },
+        },
+    }
+
+
+def poll_records(model, recorded_at, *visits):
+    """Apply a poll of visits to the model and get the records of its changes."""
+    return get_change_records(model.apply([stop_monitoring(*visits)]), recorded_at)
+
+
+def stop_monitoring(*visits):
+    """Wrap visits in a stop monitoring response."""
+    return {
+        "ServiceDelivery": {
+            "StopMonitoringDelivery": [{"MonitoredStopVisit": list(visits)}]
+        }
+    }
+
+
+@pytest.mark.parametrize(
+    "test_id, journey, expected",
+    [
+        (
+            "framed",
+            {
+                "FramedVehicleJourneyRef": {
+                    "DataFrameRef": "2024-02-24",
+                    "DatedVehicleJourneyRef": "1234",
+                }
+            },
+            "2024-02-24:1234",
+        ),
+        ("name-only", {"VehicleJourneyName": "1234"}, "1234"),
+        (
+            "fallback",
+            {
+                "LineRef": "A",
+                "MonitoredCall": {"AimedDepartureTime": "2024-02-24T19:30:00+01:00"},
+            },
+            "A@2024-02-24T19:30:00+01:00",
+        ),
+        (
+            "expected-fallback",
+            {
+                "LineRef": "A",
+                "MonitoredCall": {"ExpectedDepartureTime": "2024-02-24T19:32:00+01:00"},
+            },
+            "A@2024-02-24T19:32:00+01:00",
+        ),
+    ],
+)
+def test_get_vehicle_journey_ref(test_id, journey, expected):
+    """Test get_vehicle_journey_ref."""
+    assert get_vehicle_journey_ref(journey) == expected, f"Failed {test_id}"
+
+
+def test_get_change_records_deduplicates():
+    """Test that a journey seen twice at the same stop gives one record."""
+    visit = stop_visit(
+        "1", "A", "2024-02-24T19:30:00+01:00", "2024-02-24T19:32:00+01:00"
+    )
+    records = poll_records(DeparturesModel(), 0, visit, visit)
+    assert len(records) == 1
+    assert records[0][:4] == ("2024-02-24:1", "12345", "StationA", "A")
+    assert records[0][7] == 120
+
+
+def test_get_change_records_skips_unchanged_and_removed():
+    """Test that only inserted or updated departures give records."""
+    model = DeparturesModel()
+    first = stop_visit(
+        "1", "A", "2024-02-24T19:30:00+01:00", "2024-02-24T19:31:00+01:00"
+    )
+    second = stop_visit(
+        "2", "A", "2024-02-24T19:40:00+01:00", "2024-02-24T19:40:00+01:00"
+    )
+    delayed = stop_visit(
+        "2", "A", "2024-02-24T19:40:00+01:00", "2024-02-24T19:43:00+01:00"
+    )
+    assert len(poll_records(model, 1, first, second)) == 2
+    assert poll_records(model, 2, first, second) == []
+
+    records = poll_records(model, 3, delayed)
+    assert [record[0] for record in records] == ["2024-02-24:2"]
+    assert records[0][7:] == (180, 3)
+
+
+def test_model_accepts_visits_without_journey_ref():
+    """Test that a visit with no journey ref nor aimed time is still applied."""
+    visit = stop_visit("1", "A", None, "2024-02-24T19:32:00+01:00")
+    del visit["MonitoredVehicleJourney"]["FramedVehicleJourneyRef"]
+    model = DeparturesModel()
+
+    assert poll_records(model, 0, visit) == []
+    assert list(model.entries) == [("A@2024-02-24T19:32:00+01:00", "12345")]
+
+
+def test_get_change_records_skips_missing_aimed_time():
+    """Test that visits without an aimed departure time are ignored."""
+    visit = stop_visit("1", "A", None, "2024-02-24T19:32:00+01:00")
+    assert poll_records(DeparturesModel(), 0, visit) == []
+
+
+def test_delay_store_upsert_and_stats(tmp_path):
+    """Test that records are upserted and aggregated per line and stop."""
+    conn = open_delay_store(str(tmp_path))
+    model = DeparturesModel()
+    early = poll_records(
+        model,
+        1,
+        stop_visit("1", "A", "2024-02-24T19:30:00+01:00", "2024-02-24T19:31:00+01:00"),
+        stop_visit("2", "A", "2024-02-24T19:40:00+01:00", "2024-02-24T19:40:00+01:00"),
+    )
+    late = poll_records(
+        model,
+        2,
+        stop_visit("1", "A", "2024-02-24T19:30:00+01:00", "2024-02-24T19:34:00+01:00"),
+    )
+    insert_delay_records(conn, early)
+    insert_delay_records(conn, late)
+
+    assert query_delay_stats(conn, stop="stationa") == [
+        ["A", "StationA", 2, 120.0, 240, 50.0]
+    ]
+    assert query_delay_stats(conn, line="B") == []
+    conn.close()
+
+
+def test_display_delay_stats():
+    """Test that statistics are formatted in minutes and percents."""
+    table = str(display_delay_stats([["A", "StationA", 2, 120.0, 240, 50.0]]))
+    assert "2.0 min" in table and "4.0 min" in table and "50 %" in table
+
+
+def test_delay_stats_mix_daily_rollups_and_recent_departures(tmp_path):
+    """Test that rolled up days, partial days and late records are all counted."""
+    conn = open_delay_store(str(tmp_path))
+    now = int(time.time())
+
+    def delay_record(journey_ref, aimed, delay):
+        return (journey_ref, "1", "StationA", "A", "B", aimed, aimed + delay, delay, 0)
+
+    insert_delay_records(
+        conn,
+        [
+            delay_record("1", now - 10 * 86400, 0),
+            delay_record("2", now - 5 * 86400, 120),
+            delay_record("3", now - 60, 300),
+        ],
+    )
+    assert query_delay_stats(conn, since=now - 30 * 86400) == [
+        ["A", "StationA", 3, 140.0, 300, 100 / 3]
+    ]
+    assert query_delay_stats(conn, since=now - 6 * 86400, until=now - 3600) == [
+        ["A", "StationA", 1, 120.0, 120, 0.0]
+    ]
+
+    # a record departing on a rolled up day is still counted
+    insert_delay_records(conn, [delay_record("4", now - 5 * 86400 - 60, 60)])
+    assert query_delay_stats(conn, since=now - 6 * 86400, until=now - 3600) == [
+        ["A", "StationA", 2, 90.0, 120, 0.0]
+    ]
+    conn.close()
+
+
+def test_record_reports_network_errors(tmp_path):
+    """Test that record reports a failed estimated timetable download."""
+    with patch(
+        "cts_cli.api.departure_time.api_get",
+        side_effect=ConnectionError("network down"),
+    ):
+        result = CliRunner().invoke(
+            record, ["-s", "A"], obj={"data_dir": str(tmp_path)}
+        )
+
+    assert result.exit_code == 0
+    assert "Could not get the estimated timetable: network down" in result.output
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# pylint: skip-file
+"""Fetch scheduler test module."""
+import pytest
+from cts_cli.utils.scheduler import FetchScheduler
+
+
+class FakeClock:
+    """Clock only moving forward when the scheduler waits."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_scheduler(jobs, interval, runs, on_error=None, clock=None):
+    """Run the scheduler loop in the current thread until `runs` jobs ran."""
+    clock = clock or FakeClock()
+    calls = []
+    scheduler = FetchScheduler(
+        [
+            lambda i=i, job=job: (calls.append((i, clock.now)), job())
+            for i, job in enumerate(jobs)
+        ],
+        interval=interval,
+        on_error=on_error,
+        clock=clock,
+    )
+
+    def wait(timeout):
+        if len(calls) >= runs:
+            return True
+        clock.now += timeout
+        return False
+
+    scheduler._stopped.wait = wait
+    scheduler._run()
+    return calls
+
+
+def test_jobs_are_staggered_over_the_interval():
+    """Test that jobs run in turn, spread over the interval."""
+    calls = run_scheduler([lambda: None, lambda: None], interval=20, runs=4)
+
+    assert calls == [(0, 100.0), (1, 110.0), (0, 120.0), (1, 130.0)]
+
+
+def test_late_jobs_do_not_burst():
+    """Test that a job running late is not repeated to catch up."""
+    clock = FakeClock()
+
+    def slow_job():
+        clock.now += 25
+
+    calls = run_scheduler([slow_job], interval=10, runs=3, clock=clock)
+
+    assert [start for _, start in calls] == [100.0, 125.0, 150.0]
+
+
+@pytest.mark.parametrize("error", [ValueError("bad"), KeyError("missing")])
+def test_failing_job_does_not_stop_the_others(error):
+    """Test that a failing job is reported and the other jobs keep running."""
+    errors = []
+
+    def failing_job():
+        raise error
+
+    calls = run_scheduler(
+        [failing_job, lambda: None],
+        interval=20,
+        runs=4,
+        on_error=lambda i, e: errors.append((i, e)),
+    )
+
+    assert [i for i, _ in calls] == [0, 1, 0, 1]
+    assert errors == [(0, error), (0, error)]
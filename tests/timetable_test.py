@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# pylint: skip-file
+"""Timetable and journey planner test module."""
+from datetime import datetime
+from unittest.mock import patch
+from click.testing import CliRunner
+import pytest
+from requests import ConnectionError
+from cts_cli.cli.route import route
+from cts_cli.utils.timetable import Timetable, compile_timetable
+
+DAY = "2024-02-26T"
+
+
+def journey(line, *calls):
+    """Build an EstimatedVehicleJourney from (stop name, HH:MM) calls."""
+    return {
+        "LineRef": line,
+        "DestinationName": calls[-1][0],
+        "EstimatedCalls": [
+            {
+                "StopPointRef": name,
+                "StopPointName": name,
+                "ExpectedDepartureTime": f"{DAY}{time}:00+01:00",
+            }
+            for name, time in calls
+        ],
+    }
+
+
+def ts(time):
+    """Get the timestamp of a HH:MM time of the test day."""
+    return int(datetime.fromisoformat(f"{DAY}{time}:00+01:00").timestamp())
+
+
+@pytest.fixture
+def timetable(tmp_path):
+    """Compile a small network and load it."""
+    estimated_time_data = {
+        "ServiceDelivery": {
+            "EstimatedTimetableDelivery": [
+                {
+                    "EstimatedJourneyVersionFrame": [
+                        {
+                            "EstimatedVehicleJourney": [
+                                journey(
+                                    "A", ("Gare", "08:00"), ("Homme de Fer", "08:05")
+                                ),
+                                journey(
+                                    "A", ("Gare", "08:10"), ("Homme de Fer", "08:15")
+                                ),
+                                journey(
+                                    "C",
+                                    ("Homme de Fer", "08:05"),
+                                    ("Republique", "08:10"),
+                                ),
+                                journey(
+                                    "C",
+                                    ("Homme de Fer", "08:07"),
+                                    ("Republique", "08:12"),
+                                ),
+                                journey(
+                                    "E",
+                                    ("Gare", "08:01"),
+                                    ("Parc", "08:20"),
+                                    ("Republique", "08:30"),
+                                ),
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
+    }
+    assert compile_timetable(estimated_time_data, str(tmp_path)) == 6
+    return Timetable(str(tmp_path))
+
+
+def test_route_with_transfer(timetable):
+    """Test that a transfer needs the minimum transfer time."""
+    legs = timetable.route(
+        timetable.station_id("gare"),
+        timetable.station_id("REPUBLIQUE"),
+        ts("07:55"),
+    )
+    assert [
+        (timetable.trips[trip][0], timetable.stations[dep], dep_time, arr_time)
+        for trip, dep, dep_time, _, arr_time in legs
+    ] == [
+        ("A", "Gare", ts("08:00"), ts("08:05")),
+        ("C", "Homme de Fer", ts("08:07"), ts("08:12")),
+    ]
+
+
+def test_route_staying_on_board(timetable):
+    """Test a journey staying in the same vehicle across stations."""
+    legs = timetable.route(
+        timetable.station_id("Gare"), timetable.station_id("Republique"), ts("08:01")
+    )
+    assert len(legs) == 1
+    assert timetable.trips[legs[0][0]][0] == "E"
+    assert legs[0][4] == ts("08:30")
+
+
+def test_route_unreachable(timetable):
+    """Test that no journey is found after the last departure."""
+    assert (
+        timetable.route(
+            timetable.station_id("Gare"), timetable.station_id("Parc"), ts("09:00")
+        )
+        == []
+    )
+    assert timetable.station_id("Unknown") is None
+
+
+def test_route_command_reports_network_errors():
+    """Test that the route command reports a failed timetable download."""
+    with patch(
+        "cts_cli.cli.route.load_timetable",
+        side_effect=ConnectionError("network down"),
+    ):
+        result = CliRunner().invoke(route, ["Gare", "Republique"], obj={})
+
+    assert result.exit_code == 0
+    assert "Could not get the estimated timetable: network down" in result.output